@@ -0,0 +1,201 @@
+"""
+HTTP API over chat_core (FastAPI).
+
+Endpoints:
+    GET    /health                 liveness + active configuration
+    GET    /metrics                per-route model latency/tokens, hedging, skipped generations, section reuse, cache usage
+    POST   /chat                   free-form chat turn with session history
+    POST   /generate               generate content for a mode (JSON response)
+    POST   /generate/stream        same, streamed as server-sent events
+    DELETE /sessions/{session_id}  clear a session (chat and all modes)
+
+Run with several workers; use SESSION_STORE=sqlite so sessions are shared:
+
+    SESSION_STORE=sqlite python -m backend.api --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Any, Dict, Iterator
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+try:
+    from . import chat_core  # type: ignore
+    from . import config  # type: ignore
+    from . import context_cache  # type: ignore
+    from . import fingerprint  # type: ignore
+    from . import hedging  # type: ignore
+    from . import long_input  # type: ignore
+    from . import model_router  # type: ignore
+    from . import sections  # type: ignore
+    from . import session_memory as memory  # type: ignore
+    from .profile_extraction import extract_user_info_from_chat, merge_extracted_info  # type: ignore
+except ImportError:  # when executed without package context
+    import chat_core  # type: ignore
+    import config  # type: ignore
+    import context_cache  # type: ignore
+    import fingerprint  # type: ignore
+    import hedging  # type: ignore
+    import long_input  # type: ignore
+    import model_router  # type: ignore
+    import sections  # type: ignore
+    import session_memory as memory  # type: ignore
+    from profile_extraction import extract_user_info_from_chat, merge_extracted_info  # type: ignore
+
+MODES = ["Personal Bio", "Project Summaries", "Learning Reflections"]
+
+
+def _mode_slug(mode: str) -> str:
+    return mode.lower().replace(" ", "_")
+
+
+_MODES_BY_KEY = {key: mode for mode in MODES for key in (mode.lower(), _mode_slug(mode))}
+
+
+class ChatRequest(BaseModel):
+    session_id: str = Field(min_length=1, max_length=128)
+    message: str = Field(min_length=1)
+    history_limit: int = Field(default=20, ge=0, le=200)
+
+
+class GenerateRequest(BaseModel):
+    session_id: str = Field(min_length=1, max_length=128)
+    mode: str = "Personal Bio"
+    # Either a ready profile or the user's chat messages to extract it from
+    extracted_info: Dict[str, Any] | None = None
+    messages: list[Dict[str, str]] | None = None
+    extra_input: str | None = None
+    history_limit: int = Field(default=25, ge=0, le=200)
+
+
+def _resolve_mode(mode: str) -> str:
+    resolved = _MODES_BY_KEY.get(mode.strip().lower())
+    if resolved is None:
+        raise HTTPException(status_code=422, detail=f"Unknown mode {mode!r}; choose from {MODES}")
+    return resolved
+
+
+def _generation_args(req: GenerateRequest) -> Dict[str, Any]:
+    # Blocking (a long extra_input is summarized in chunks): call via asyncio.to_thread
+    mode = _resolve_mode(req.mode)
+    extracted_info = req.extracted_info
+    if extracted_info is None and req.messages:
+        extracted_info = extract_user_info_from_chat(req.messages)
+    extra_input = req.extra_input
+    if long_input.is_long(extra_input):
+        digest = long_input.digest(extra_input)
+        extracted_info = merge_extracted_info([extracted_info or {}, digest["profile"]])
+        extra_input = digest["context"]
+    return {
+        # Same per-mode history partitioning as the Streamlit UI
+        "session_id": f"{req.session_id}_{_mode_slug(mode)}",
+        "content_type": mode,
+        "extracted_info": extracted_info or {},
+        "extra_input": extra_input,
+        "history_limit": req.history_limit,
+    }
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_stream(args: Dict[str, Any]) -> Iterator[str]:
+    # Sync generator: Starlette iterates it in a worker thread, keeping the event loop free
+    try:
+        length = 0
+        for text in chat_core.stream_generic_content(**args):
+            length += len(text)
+            yield _sse("chunk", {"text": text})
+        yield _sse("done", {"mode": args["content_type"], "length": length})
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+
+
+app = FastAPI(title="DevFolio AI API")
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    return {"status": "ok", "model": config.MODEL_NAME, "session_store": config.SESSION_STORE}
+
+
+@app.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    # Per worker process: each worker keeps its own counters
+    return {
+        "model_routing": config.MODEL_ROUTING,
+        "routes": model_router.route_report(),
+        "hedging": hedging.hedge_report(),
+        "generation_decisions": fingerprint.decision_report(),
+        "sections": sections.section_report(),
+        "usage": context_cache.usage_report(),
+    }
+
+
+@app.post("/chat")
+async def chat(req: ChatRequest) -> Dict[str, Any]:
+    try:
+        reply = await asyncio.to_thread(
+            chat_core.chat_with_history, req.session_id, req.message, req.history_limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Model call failed: {e}")
+    return {"session_id": req.session_id, "reply": reply}
+
+
+@app.post("/generate")
+async def generate(req: GenerateRequest) -> Dict[str, Any]:
+    args = await asyncio.to_thread(_generation_args, req)
+    try:
+        content = await asyncio.to_thread(chat_core.generate_generic_content, **args)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Model call failed: {e}")
+    return {"session_id": req.session_id, "mode": args["content_type"], "content": content}
+
+
+@app.post("/generate/stream")
+async def generate_stream(req: GenerateRequest) -> StreamingResponse:
+    args = await asyncio.to_thread(_generation_args, req)
+    return StreamingResponse(
+        _sse_stream(args),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.delete("/sessions/{session_id}")
+async def reset_session(session_id: str) -> Dict[str, Any]:
+    for sid in [session_id] + [f"{session_id}_{_mode_slug(m)}" for m in MODES]:
+        await asyncio.to_thread(memory.reset_session, sid)
+        fingerprint.forget_session(sid)
+        sections.forget_session(sid)
+    model_router.forget_conversation(session_id)
+    return {"session_id": session_id, "reset": True}
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the DevFolio AI HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.workers > 1 and config.SESSION_STORE == "memory":
+        print("⚠️  SESSION_STORE=memory keeps sessions per worker; set SESSION_STORE=sqlite to share them.")
+    if args.workers > 1:
+        # Skip decisions use per-process document caches that DELETE /sessions cannot clear
+        # in other workers; the workers inherit this environment
+        os.environ["GENERATION_SKIPS"] = "off"
+    uvicorn.run("backend.api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Offline batch generation of portfolio content for many profiles.
+
+Reads profiles from JSONL or CSV, runs generate_generic_content for each requested
+mode on a bounded thread pool (rate limited), appends results to a JSONL file as
+they finish and skips already-completed items when re-run with the same output.
+
+Input rows (JSONL objects or CSV columns) need an "id" and one of:
+    extracted_info  dict (or JSON string in CSV)
+    messages        list of {"role": "user", "content": ...} chat messages
+    transcript      plain text of what the user said
+Optional "extra_input" is passed through as additional instructions.
+
+    python -m backend.batch_generate profiles.jsonl -o results.jsonl --workers 4 --rpm 60
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+try:
+    from . import chat_core  # type: ignore
+    from . import hedging  # type: ignore
+    from . import session_memory as memory  # type: ignore
+    from .profile_extraction import extract_user_info_from_chat  # type: ignore
+except ImportError:  # when executed without package context
+    import chat_core  # type: ignore
+    import hedging  # type: ignore
+    import session_memory as memory  # type: ignore
+    from profile_extraction import extract_user_info_from_chat  # type: ignore
+
+MODES = ["Personal Bio", "Project Summaries", "Learning Reflections"]
+
+
+def _profile_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    info = row.get("extracted_info")
+    if isinstance(info, str) and info.strip():
+        info = json.loads(info)
+    if isinstance(info, dict):
+        return info
+    messages = row.get("messages")
+    if isinstance(messages, str) and messages.strip():
+        messages = json.loads(messages)
+    if isinstance(messages, list):
+        return extract_user_info_from_chat(messages)
+    transcript = row.get("transcript")
+    if isinstance(transcript, str) and transcript.strip():
+        return extract_user_info_from_chat([{"role": "user", "content": transcript}])
+    raise ValueError("row needs one of: extracted_info, messages, transcript")
+
+
+def load_profiles(path: str | Path) -> list[Dict[str, Any]]:
+    """Load and normalize input rows to {"id", "extracted_info", "extra_input"}."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows: Iterable[Dict[str, Any]] = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    profiles = []
+    # The id names the item's sessions and checkpoint records, so it must be unique
+    seen: Dict[str, int] = {}
+    for n, row in enumerate(rows, 1):
+        try:
+            info = _profile_from_row(row)
+        except ValueError as e:
+            raise ValueError(f"{path.name} row {n}: {e}") from e
+        profile_id = str(row.get("id") or f"row{n}")
+        if profile_id in seen:
+            raise ValueError(f"{path.name} row {n}: duplicate id {profile_id!r} (first used in row {seen[profile_id]})")
+        seen[profile_id] = n
+        profiles.append({
+            "id": profile_id,
+            "extracted_info": info,
+            "extra_input": row.get("extra_input") or None,
+        })
+    return profiles
+
+
+def load_checkpoint(output_path: str | Path) -> set[tuple[str, str]]:
+    """(id, mode) pairs already written successfully to the output file."""
+    done: set[tuple[str, str]] = set()
+    path = Path(output_path)
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interruption; that item is simply redone
+                continue
+            if rec.get("status") == "ok":
+                done.add((str(rec.get("id")), str(rec.get("mode"))))
+    return done
+
+
+def _terminate_partial_line(output_path: str | Path) -> None:
+    """End a line cut short by an interruption so new records start on their own line."""
+    path = Path(output_path)
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+class RateLimiter:
+    """Spaces call starts evenly so all workers together stay under `per_minute`."""
+
+    def __init__(self, per_minute: float = 0):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free now (never waits)."""
+        if not self.interval:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                return False
+            self._next = now + self.interval
+            return True
+
+
+def _generate_one(
+    profile: Dict[str, Any],
+    mode: str,
+    limiter: RateLimiter,
+    retries: int,
+    history_limit: int,
+) -> Dict[str, Any]:
+    session_id = f"batch_{profile['id']}_{mode.lower().replace(' ', '_')}"
+    start = time.perf_counter()
+    attempts = 0
+    error = ""
+    content = None
+    while attempts <= retries:
+        attempts += 1
+        limiter.wait()
+        try:
+            content = chat_core.generate_generic_content(
+                session_id=session_id,
+                content_type=mode,
+                extracted_info=profile["extracted_info"],
+                extra_input=profile["extra_input"],
+                history_limit=history_limit,
+            )
+            break
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if attempts <= retries:
+                time.sleep(min(2 ** attempts, 30))
+        finally:
+            # Batch items are independent; don't keep their history around
+            memory.reset_session(session_id)
+    record = {
+        "id": profile["id"],
+        "mode": mode,
+        "status": "ok" if content is not None else "error",
+        "latency_s": round(time.perf_counter() - start, 3),
+        "attempts": attempts,
+    }
+    if content is not None:
+        record["content"] = content
+    else:
+        record["error"] = error
+    return record
+
+
+def run_batch(
+    profiles: list[Dict[str, Any]],
+    output_path: str | Path,
+    modes: list[str] | None = None,
+    workers: int = 4,
+    requests_per_minute: float = 0,
+    retries: int = 2,
+    history_limit: int = 20,
+) -> Dict[str, Any]:
+    """Generate every (profile, mode) pair not already in the output; return a summary."""
+    modes = modes or MODES
+    done = load_checkpoint(output_path)
+    pending = [(p, m) for p in profiles for m in modes if (p["id"], m) not in done]
+    skipped = len(profiles) * len(modes) - len(pending)
+
+    limiter = RateLimiter(requests_per_minute)
+    # Hedged duplicates are requests too: they only start when the limiter has a free slot
+    hedging.set_gate(limiter.try_acquire)
+    latencies: list[float] = []
+    failed = 0
+    start = time.perf_counter()
+    _terminate_partial_line(output_path)
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [
+                pool.submit(_generate_one, p, m, limiter, retries, history_limit)
+                for p, m in pending
+            ]
+            for future in as_completed(futures):
+                record = future.result()
+                # Results are written from this thread only, one flushed line per item
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if record["status"] == "ok":
+                    latencies.append(record["latency_s"])
+                else:
+                    failed += 1
+    finally:
+        hedging.set_gate(None)
+    wall = time.perf_counter() - start
+
+    summary: Dict[str, Any] = {
+        "items": len(pending) + skipped,
+        "skipped": skipped,
+        "succeeded": len(latencies),
+        "failed": failed,
+        "wall_s": round(wall, 2),
+        "throughput_per_min": round(len(latencies) / wall * 60, 2) if wall > 0 else 0.0,
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        summary["latency_s"] = {
+            "mean": round(statistics.fmean(ordered), 3),
+            "p50": round(statistics.median(ordered), 3),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max": round(ordered[-1], 3),
+        }
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="profiles file (.jsonl or .csv)")
+    parser.add_argument("-o", "--output", required=True, help="results JSONL (also the resume checkpoint)")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated content modes")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent generations")
+    parser.add_argument("--rpm", type=float, default=0, help="max requests per minute across workers (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=2, help="retries per item on errors")
+    parser.add_argument("--history-limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}; choose from {', '.join(MODES)}")
+
+    try:
+        profiles = load_profiles(args.input)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    summary = run_batch(
+        profiles,
+        args.output,
+        modes=modes,
+        workers=args.workers,
+        requests_per_minute=args.rpm,
+        retries=args.retries,
+        history_limit=args.history_limit,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,43 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-#from langchain_community.chat_models import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+# LangChain and the Gemini SDK are imported lazily (see _get_llm/_to_lc_message) so that
+# importing this module does not pay their start-up cost.
 try:
     from . import session_memory as memory  # type: ignore
     from . import config  # type: ignore
+    from . import prompt_registry  # type: ignore
+    from . import context_cache  # type: ignore
+    from . import profiling  # type: ignore
+    from . import model_router  # type: ignore
+    from . import hedging  # type: ignore
+    from . import fingerprint  # type: ignore
+    from . import sections  # type: ignore
 except ImportError:  # when executed without package context
     import session_memory as memory  # type: ignore
     import config  # type: ignore
+    import prompt_registry  # type: ignore
+    import context_cache  # type: ignore
+    import profiling  # type: ignore
+    import model_router  # type: ignore
+    import hedging  # type: ignore
+    import fingerprint  # type: ignore
+    import sections  # type: ignore
+import hashlib
 import json
-from pathlib import Path
-from typing import Any, Dict
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterator
 # Removed PDF imports and PDFManager. Rely solely on chat history.
 
+@lru_cache(maxsize=16)
+def _get_llm(model: str, temperature: float, max_output_tokens: int | None = None):
+    """Create (once per model/temperature/output limit) the Gemini chat client."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    if max_output_tokens:
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature, max_output_tokens=max_output_tokens)
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
 def _to_lc_message(item: dict):
+    from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
     role = item.get("role")
     content = item.get("content", "")
     if role == "human":
@@ -23,54 +48,181 @@ def _to_lc_message(item: dict):
         return SystemMessage(content=content)
     return HumanMessage(content=content)
 
-def _has_system_content(history: list[dict], content: str) -> bool:
-    return any(m.get("role") == "system" and m.get("content", "") == content for m in history)
+def _compact_profile(extracted_info: Dict[str, Any] | None) -> str:
+    """Deterministic, compact JSON of the non-empty profile fields (stable across calls)."""
+    compact: Dict[str, Any] = {}
+    for key, value in (extracted_info or {}).items():
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if v}
+        if value:
+            compact[key] = value
+    if not compact:
+        return ""
+    return json.dumps(compact, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+def _stable_prefix(system_prompt: str | None) -> list[str]:
+    """Global prompt then mode prompt: identical bytes on every call for a given mode."""
+    parts = []
+    global_sp = getattr(config, "GLOBAL_SYSTEM_PROMPT", "").strip()
+    if global_sp:
+        parts.append(global_sp)
+    if system_prompt and system_prompt.strip():
+        parts.append(system_prompt.strip())
+    return parts
+
+def _prepare_messages(
+    session_id: str,
+    user_input: str,
+    history_limit: int,
+    system_prompt: str | None,
+    profile: str | None,
+    model: str,
+) -> tuple[list, Dict[str, Any]]:
+    """Build the LangChain messages (and invoke kwargs) for one call."""
+    # Only the tail is fetched; the store reads it in one round trip
+    history = memory.get_history(session_id, history_limit or None)
+
+    # 1) Byte-stable prefix (global prompt, mode prompt, compacted profile) so provider-side
+    #    prefix caching can reuse it; system prompts are no longer interleaved with history
+    prefix = _stable_prefix(system_prompt)
+    profile_block = f"User profile (JSON):\n{profile}" if profile else ""
+
+    # 2) Variable tail: recent conversation turns and the new input
+    turns = [m for m in history if m.get("role") != "system"]
+    recent = turns[-history_limit:] if history_limit else turns
+    tail = [_to_lc_message(m) for m in recent]
+    tail.append(_to_lc_message({"role": "human", "content": user_input}))
+
+    cache = context_cache.get_backend()
+    cache_name = cache.get_or_create(model, prefix) if cache is not None and prefix else None
+    if cache_name:
+        # Prefix is served from the provider cache; the profile travels with the contents
+        lead = [_to_lc_message({"role": "human", "content": profile_block})] if profile_block else []
+        return lead + tail, {"cached_content": cache_name}
+    system_parts = prefix + ([profile_block] if profile_block else [])
+    return [_to_lc_message({"role": "system", "content": p}) for p in system_parts] + tail, {}
+
+def _text(content: Any) -> str:
+    """Message content as plain text (some models return a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else str(block.get("text", ""))
+            for block in content
+            if isinstance(block, (str, dict))
+        )
+    return str(content or "")
 
 def chat_with_history(
     session_id: str, 
     user_input: str, 
     history_limit: int = 20, 
     system_prompt: str | None = None,
+    profile: str | None = None,
+    route: str | None = None,
+    history_input: str | None = None,
 ) -> str:
-    history = memory.get_history(session_id)
+    """Send `user_input` with the session's recent history; record the turn in history.
 
-    # 1) Ensure global system prompt is present once per session
-    global_sp = getattr(config, "GLOBAL_SYSTEM_PROMPT", "").strip()
-    if global_sp and not _has_system_content(history, global_sp):
-        memory.append_message(session_id, "system", global_sp)
-        history = memory.get_history(session_id)
+    `history_input`, if given, is stored as the human turn instead of `user_input`
+    (e.g. the user's own words without the generation scaffolding).
+    """
+    route = route or _chat_route(user_input)
+    rule = model_router.resolve(route)
+    start = time.perf_counter()
+    with profiling.call("chat_with_history"):
+        messages, invoke_kwargs = _prepare_messages(
+            session_id, user_input, history_limit, system_prompt, profile, rule["model"]
+        )
 
-    # 2) Ensure template-specific system prompt is present (even if global exists)
-    if system_prompt:
-        sp = system_prompt.strip()
-        if sp and not _has_system_content(history, sp):
-            memory.append_message(session_id, "system", sp)
-            history = memory.get_history(session_id)
+        llm = _get_llm(rule["model"], config.TEMPERATURE, rule["max_output_tokens"])
+        try:
+            if hedging.enabled():
+                resp = hedging.invoke(llm, messages, invoke_kwargs, route, session_id)
+            else:
+                resp = llm.invoke(messages, **invoke_kwargs)
+        except Exception:
+            model_router.record(route, rule["model"], time.perf_counter() - start, error=True)
+            raise
+    content = _text(resp.content) if resp is not None else ""
+    usage = getattr(resp, "usage_metadata", None)
+    context_cache.record_usage(usage)
+    model_router.record(route, rule["model"], time.perf_counter() - start, usage)
+
+    # Written once, even when a hedged duplicate request was sent
+    memory.append_message(session_id, "human", user_input if history_input is None else history_input)
+    memory.append_message(session_id, "ai", content)
+
+    return content
 
-    # 3) Use only chat history context; PDF context removed
-    recent = history[-history_limit:] if history_limit else history
-    messages = [_to_lc_message(m) for m in recent]
-    messages.append(HumanMessage(content=user_input))
+def stream_with_history(
+    session_id: str,
+    user_input: str,
+    history_limit: int = 20,
+    system_prompt: str | None = None,
+    profile: str | None = None,
+    route: str | None = None,
+    history_input: str | None = None,
+) -> Iterator[str]:
+    """Like chat_with_history, but yields text chunks as they arrive.
 
-    llm = ChatGoogleGenerativeAI(model=config.MODEL_NAME, temperature=config.TEMPERATURE)
-    resp = llm.invoke(messages)
+    History is only updated once the full response has been received.
+    """
+    route = route or _chat_route(user_input)
+    rule = model_router.resolve(route)
+    start = time.perf_counter()
+    first_chunk = None
+    with profiling.call("stream_with_history"):
+        messages, invoke_kwargs = _prepare_messages(
+            session_id, user_input, history_limit, system_prompt, profile, rule["model"]
+        )
 
-    memory.append_message(session_id, "human", user_input)
-    memory.append_message(session_id, "ai", resp.content)
+        llm = _get_llm(rule["model"], config.TEMPERATURE, rule["max_output_tokens"])
+        full = None
+        if hedging.enabled():
+            chunks = hedging.stream(llm, messages, invoke_kwargs, route, session_id)
+        else:
+            chunks = llm.stream(messages, **invoke_kwargs)
+        try:
+            for chunk in chunks:
+                full = chunk if full is None else full + chunk
+                text = _text(chunk.content)
+                if text:
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - start
+                    yield text
+        except Exception:
+            model_router.record(route, rule["model"], time.perf_counter() - start, error=True)
+            raise
+    content = _text(full.content) if full is not None else ""
+    usage = getattr(full, "usage_metadata", None)
+    context_cache.record_usage(usage)
+    model_router.record(route, rule["model"], time.perf_counter() - start, usage, first_chunk)
 
-    return resp.content
+    memory.append_message(session_id, "human", user_input if history_input is None else history_input)
+    memory.append_message(session_id, "ai", content)
 
-_PROMPTS_CACHE: Dict[str, Any] | None = None
+def summarize(text: str, instructions: str, route: str = model_router.SUMMARIZE) -> str:
+    """One-shot model call without session history (e.g. condensing part of a pasted resume)."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+    rule = model_router.resolve(route)
+    start = time.perf_counter()
+    with profiling.call("summarize"):
+        llm = _get_llm(rule["model"], 0.0, rule["max_output_tokens"])
+        try:
+            resp = llm.invoke([SystemMessage(content=instructions), HumanMessage(content=text)])
+        except Exception:
+            model_router.record(route, rule["model"], time.perf_counter() - start, error=True)
+            raise
+    usage = getattr(resp, "usage_metadata", None)
+    context_cache.record_usage(usage)
+    model_router.record(route, rule["model"], time.perf_counter() - start, usage)
+    return _text(resp.content)
 
 def _load_prompts() -> Dict[str, Any]:
-    global _PROMPTS_CACHE
-    if _PROMPTS_CACHE is None:
-        # Load prompts from backend/prompts.json to align with frontend usage
-        path = Path(__file__).resolve().parent / "prompts.json"
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        _PROMPTS_CACHE = data.get("prompts", {})
-    return _PROMPTS_CACHE
+    # Shared with the frontend; parsed once per process and reloaded on file change
+    return prompt_registry.get_templates()
 
 def _normalize_params(params: Dict[str, Any]) -> Dict[str, str]:
     norm: Dict[str, str] = {}
@@ -87,13 +239,12 @@ def render_template(template_key: str, params: Dict[str, Any]) -> tuple[str, str
 
 # Generic content generator that builds prompts dynamically from extracted info
 
-def generate_generic_content(
-    session_id: str,
+def _generic_prompts(
     content_type: str,
-    extracted_info: Dict[str, Any] | None = None,
-    extra_input: str | None = None,
-    history_limit: int = 20,
-) -> str:
+    extracted_info: Dict[str, Any] | None,
+    extra_input: str | None,
+) -> tuple[str, str, str]:
+    """(system_prompt, user_prompt, profile) for a generic content generation."""
     extracted_info = extracted_info or {}
 
     # Build a dynamic system prompt
@@ -104,94 +255,277 @@ def generate_generic_content(
     ]
     system_prompt = "\n".join(sys_lines)
 
-    # Summarize available info succinctly for the model
-    info_parts: list[str] = []
-    name = extracted_info.get("name")
-    title = extracted_info.get("title")
-    if name or title:
-        info_parts.append(f"Name/Title: {name or ''} {('- ' + title) if title else ''}".strip())
-    if extracted_info.get("contact"):
-        info_parts.append("Contact info present")
-    techs = extracted_info.get("technologies") or []
-    if techs:
-        info_parts.append("Technologies: " + ", ".join(map(str, techs[:20])))
-    exp_years = (extracted_info.get("experience") or {}).get("years")
-    if exp_years:
-        info_parts.append(f"Experience: {exp_years} years")
-    if extracted_info.get("education"):
-        info_parts.append("Education data present")
-    if extracted_info.get("projects"):
-        info_parts.append("Projects data present")
-    if extracted_info.get("achievements"):
-        info_parts.append("Achievements data present")
-    if extracted_info.get("certifications"):
-        info_parts.append("Certifications data present")
-
-    info_summary = ("- " + "\n- ".join(info_parts)) if info_parts else "- General professional information from chat"
+    # The profile goes into the stable prompt prefix (after the mode prompt) as compact JSON
+    profile = _compact_profile(extracted_info)
 
     # User prompt with guidance and any extra user input
     guidance = (
         f"Create a polished {content_type.lower()} using README markdown with relevant sections "
         f"(header, contact, summary, skills, experience, education, projects, achievements, certifications as applicable).\n"
-        f"Incorporate the conversation context and the available data succinctly."
+        f"Incorporate the conversation context and the user profile data succinctly."
     )
     recent_note = f"\n\nAdditional input: {extra_input}" if extra_input else ""
 
-    user_prompt = (
-        f"Available data summary:\n{info_summary}\n\n"
-        f"{guidance}{recent_note}"
-    )
+    user_prompt = f"{guidance}{recent_note}"
+    return system_prompt, user_prompt, profile
+
+def _structured_prompts(content_type: str, titles: list[str], extra_input: str | None) -> tuple[str, str]:
+    """(system_prompt, user_prompt) asking for the given sections as a JSON object."""
+    # Constant per mode, so the stable prefix stays cacheable whichever sections are requested
+    system_prompt = "\n".join([
+        f"You are a professional content writer that writes the sections of a {content_type.lower()}.",
+        "Answer with a single JSON object and nothing else: each key is a section name, each value is "
+        "that section's markdown body (bullet points, professional tone) without its heading.",
+        "Only state what the conversation and the user profile support; use an empty string for a "
+        "section with nothing meaningful to say.",
+    ])
+    user_prompt = "Write these sections: " + json.dumps(titles, ensure_ascii=False)
+    if extra_input:
+        user_prompt += f"\n\nAdditional input: {extra_input}"
+    return system_prompt, user_prompt
+
+def _generate_structured(
+    session_id: str,
+    content_type: str,
+    extracted_info: Dict[str, Any] | None,
+    extra_input: str | None,
+    history_limit: int,
+    profile: str,
+    decision: Dict[str, Any],
+) -> tuple[str, bool]:
+    """(document, rendered) from per-section cache entries, asking the model only for stale sections.
+
+    `rendered` is False when the reply was not JSON and is returned as written.
+    """
+    hashes = {
+        title: sections.section_hash(extracted_info, fields)
+        for title, fields in sections.sections_for(content_type).items()
+    }
+    # Section bodies are cached per process, like skip decisions: not reusable across workers
+    bodies = sections.cached(session_id, hashes) if config.GENERATION_SKIPS else {}
+    stale = [title for title in hashes if title not in bodies]
+    if decision["salient"]:
+        # New input: rewrite the section it targets, or every section if it targets none
+        key = _match_section(extra_input, content_type)
+        target = sections.SECTION_TITLES.get(key) if key else None
+        stale = [t for t in hashes if t in stale or t == target] if target in hashes else list(hashes)
+    if not stale:
+        sections.store(session_id, hashes, {}, reused=len(bodies))
+        return sections.render(content_type, extracted_info, bodies), True
 
-    # Invoke with chat history
-    return chat_with_history(
+    if len(stale) == len(hashes):
+        route = _planned_route(session_id, content_type, profile, extra_input, decision)
+    else:
+        route = model_router.SECTION_EDIT
+    system_prompt, user_prompt = _structured_prompts(content_type, stale, extra_input)
+    reply = chat_with_history(
         session_id=session_id,
         user_input=user_prompt,
         history_limit=history_limit,
         system_prompt=system_prompt,
+        profile=profile,
+        route=route,
+        history_input=_canonical_turn(content_type, profile, extra_input),
     )
+    try:
+        fresh = sections.parse_sections(reply, content_type)
+    except ValueError:
+        # Not JSON after all (json.JSONDecodeError is a ValueError): show the reply as written
+        return reply, False
+    fresh = {title: body for title, body in fresh.items() if title in stale}
+    sections.store(session_id, hashes, fresh, reused=len(set(bodies) - set(fresh)))
+    bodies.update(fresh)
+    return sections.render(content_type, extracted_info, bodies), True
 
+def _canonical_turn(content_type: str, profile: str, extra_input: str | None) -> str:
+    """Compact human turn stored in history for a generation request.
 
-def _infer_target_section(user_input, mode):
-    """Infer which section the user wants to update based on their input"""
-    input_lower = user_input.lower()
-    
-    # Common section keywords for different modes
-    section_keywords = {
-        "Personal Bio": {
-            "about": ["about", "introduction", "intro", "overview", "summary", "bio"],
-            "skills": ["skill", "technology", "tech", "programming", "coding", "framework", "language"],
-            "experience": ["experience", "work", "career", "background", "history", "professional"],
-            "education": ["education", "degree", "school", "university", "college"],
-            "contact": ["contact", "email", "phone", "linkedin", "github", "portfolio"]
-        },
-        "Project Summaries": {
-            "overview": ["overview", "description", "summary", "about", "what is"],
-            "technologies": ["technology", "tech", "stack", "tools", "framework", "language"],
-            "features": ["feature", "functionality", "what it does", "capabilities"],
-            "challenges": ["challenge", "problem", "difficulty", "issue", "solution"],
-            "results": ["result", "impact", "outcome", "achievement", "success"]
-        },
-        "Learning Reflections": {
-            "objectives": ["objective", "goal", "purpose", "aim", "why"],
-            "skills": ["skill", "learned", "acquired", "knowledge", "understanding"],
-            "application": ["apply", "use", "practice", "implement", "real world"],
-            "challenges": ["challenge", "difficulty", "struggle", "problem"],
-            "future": ["future", "next", "continue", "improve", "develop"]
-        }
+    Only the user's own input is kept, with a reference to the template and the
+    profile it was generated from; the guidance text is rebuilt for each request.
+    """
+    turn: Dict[str, Any] = {"template": content_type}
+    if profile:
+        turn["profile"] = hashlib.sha256(profile.encode("utf-8")).hexdigest()[:12]
+    turn["input"] = extra_input.strip() if extra_input and extra_input.strip() else None
+    return json.dumps(turn, ensure_ascii=False, separators=(",", ":"))
+
+# Requests that ask for a long answer however short they are ("Rewrite my whole bio ...")
+_LONG_REPLY_RE = re.compile(
+    r"\b(?:re)?(?:write|draft|generate|create|compose|produce|expand|elaborate|detail(?:ed)?|explain|"
+    r"describe|summari[sz]e|list|outline|translate|whole|entire|full|complete|comprehensive|all)\b",
+    re.IGNORECASE,
+)
+
+def _chat_route(user_input: str) -> str:
+    """Route for a free-form chat turn, by the reply it is expected to need."""
+    text = user_input.strip()
+    if len(text) <= model_router.SHORT_REPLY_MAX_CHARS and not _LONG_REPLY_RE.search(text):
+        return model_router.SHORT_REPLY
+    return model_router.CHAT
+
+def conversation_id(session_id: str, content_type: str) -> str:
+    """Session id without the per-mode suffix ("ui_personal_bio" -> "ui"), shared by all modes."""
+    suffix = "_" + content_type.lower().replace(" ", "_")
+    return session_id[: -len(suffix)] if session_id.endswith(suffix) else session_id
+
+def _generation_route(session_id: str, content_type: str, profile: str, extra_input: str | None) -> str:
+    """Route for a document generation request."""
+    if not extra_input or not extra_input.strip():
+        # Nothing new from the user: a mode switch (or regeneration) in this conversation from a known profile
+        # Per-process state a reset on another worker cannot clear; off with GENERATION_SKIPS
+        if config.GENERATION_SKIPS and model_router.profile_generated(conversation_id(session_id, content_type), profile):
+            return model_router.MODE_SWITCH
+        return model_router.FULL_GENERATION
+    if (
+        len(extra_input.strip()) <= model_router.SECTION_EDIT_MAX_CHARS
+        and _match_section(extra_input, content_type) is not None
+        # A section edit needs a document to edit: this session has generated before
+        and memory.get_history(session_id, 1)
+    ):
+        return model_router.SECTION_EDIT
+    return model_router.FULL_GENERATION
+
+def generation_decision(
+    session_id: str,
+    content_type: str,
+    extracted_info: Dict[str, Any] | None = None,
+    extra_input: str | None = None,
+    history_limit: int = 20,
+) -> Dict[str, Any]:
+    """Whether a generation with these arguments would skip, downgrade or call the model.
+
+    Takes the same arguments as generate_generic_content, so callers can check first;
+    only skips are counted here (other outcomes are counted when the generation runs).
+    """
+    decision = fingerprint.decide(session_id, content_type, _compact_profile(extracted_info), extra_input, record=False)
+    if decision["action"] == fingerprint.SKIP:
+        fingerprint.count(fingerprint.SKIP)
+    return decision
+
+def _planned_route(session_id: str, content_type: str, profile: str, extra_input: str | None, decision: Dict[str, Any]) -> str:
+    route = _generation_route(session_id, content_type, profile, extra_input)
+    if decision["action"] == fingerprint.DOWNGRADE and route == model_router.FULL_GENERATION:
+        # Little new input on an unchanged profile: a section-sized edit is enough
+        return model_router.SECTION_EDIT
+    return route
+
+def generate_generic_content(
+    session_id: str,
+    content_type: str,
+    extracted_info: Dict[str, Any] | None = None,
+    extra_input: str | None = None,
+    history_limit: int = 20,
+) -> str:
+    system_prompt, user_prompt, profile = _generic_prompts(content_type, extracted_info, extra_input)
+    decision = fingerprint.decide(session_id, content_type, profile, extra_input)
+    if decision["action"] == fingerprint.SKIP:
+        # Nothing relevant is new: reuse the document already generated for this fingerprint
+        return decision["document"]
+    if config.STRUCTURED_OUTPUT:
+        content, rendered = _generate_structured(
+            session_id, content_type, extracted_info, extra_input, history_limit, profile, decision
+        )
+        if not rendered:
+            # Not a structured document: never serve it again for a skipped generation
+            return content
+    else:
+        route = _planned_route(session_id, content_type, profile, extra_input, decision)
+        # Invoke with chat history
+        content = chat_with_history(
+            session_id=session_id,
+            user_input=user_prompt,
+            history_limit=history_limit,
+            system_prompt=system_prompt,
+            profile=profile,
+            route=route,
+            history_input=_canonical_turn(content_type, profile, extra_input),
+        )
+    model_router.remember_profile(conversation_id(session_id, content_type), profile)
+    fingerprint.remember(session_id, content_type, profile, decision["fingerprint"], content)
+    return content
+
+def stream_generic_content(
+    session_id: str,
+    content_type: str,
+    extracted_info: Dict[str, Any] | None = None,
+    extra_input: str | None = None,
+    history_limit: int = 20,
+) -> Iterator[str]:
+    """Streaming variant of generate_generic_content (yields markdown chunks).
+
+    With STRUCTURED_OUTPUT the JSON reply cannot be shown as it arrives, so the
+    rendered document is yielded once.
+    """
+    if config.STRUCTURED_OUTPUT:
+        yield generate_generic_content(session_id, content_type, extracted_info, extra_input, history_limit)
+        return
+    system_prompt, user_prompt, profile = _generic_prompts(content_type, extracted_info, extra_input)
+    decision = fingerprint.decide(session_id, content_type, profile, extra_input)
+    if decision["action"] == fingerprint.SKIP:
+        yield decision["document"]
+        return
+    route = _planned_route(session_id, content_type, profile, extra_input, decision)
+    parts = []
+    for text in stream_with_history(
+        session_id=session_id,
+        user_input=user_prompt,
+        history_limit=history_limit,
+        system_prompt=system_prompt,
+        profile=profile,
+        route=route,
+        history_input=_canonical_turn(content_type, profile, extra_input),
+    ):
+        parts.append(text)
+        yield text
+    model_router.remember_profile(conversation_id(session_id, content_type), profile)
+    fingerprint.remember(session_id, content_type, profile, decision["fingerprint"], "".join(parts))
+
+
+# Common section keywords for different modes
+_SECTION_KEYWORDS = {
+    "Personal Bio": {
+        "about": ["about", "introduction", "intro", "overview", "summary", "bio"],
+        "skills": ["skill", "technology", "tech", "programming", "coding", "framework", "language"],
+        "experience": ["experience", "work", "career", "background", "history", "professional"],
+        "education": ["education", "degree", "school", "university", "college"],
+        "contact": ["contact", "email", "phone", "linkedin", "github", "portfolio"]
+    },
+    "Project Summaries": {
+        "overview": ["overview", "description", "summary", "about", "what is"],
+        "technologies": ["technology", "tech", "stack", "tools", "framework", "language"],
+        "features": ["feature", "functionality", "what it does", "capabilities"],
+        "challenges": ["challenge", "problem", "difficulty", "issue", "solution"],
+        "results": ["result", "impact", "outcome", "achievement", "success"]
+    },
+    "Learning Reflections": {
+        "objectives": ["objective", "goal", "purpose", "aim", "why"],
+        "skills": ["skill", "learned", "acquired", "knowledge", "understanding"],
+        "application": ["apply", "use", "practice", "implement", "real world"],
+        "challenges": ["challenge", "difficulty", "struggle", "problem"],
+        "future": ["future", "next", "continue", "improve", "develop"]
     }
-    
-    # Get the section mapping for current mode
-    mode_sections = section_keywords.get(mode, {})
-    
+}
+
+def _match_section(user_input, mode):
+    """Section key whose keywords best match the input, or None if nothing matches"""
+    input_lower = user_input.lower()
+    mode_sections = _SECTION_KEYWORDS.get(mode, {})
+
     # Check which section has the most keyword matches
     best_section = None
     best_score = 0
-    
+
     for section, keywords in mode_sections.items():
         score = sum(1 for keyword in keywords if keyword in input_lower)
         if score > best_score:
             best_score = score
             best_section = section
+    return best_section
+
+def _infer_target_section(user_input, mode):
+    """Infer which section the user wants to update based on their input"""
+    input_lower = user_input.lower()
+    best_section = _match_section(user_input, mode)
     
     # If no clear match, use some fallback logic
     if not best_section:
@@ -213,36 +547,8 @@ def _infer_target_section(user_input, mode):
             else:
                 best_section = "Learning Objectives"
     
-    # Convert to proper title case
-    if best_section:
-        if best_section == "about":
-            return "About Me"
-        elif best_section == "skills":
-            return "Skills & Technologies"
-        elif best_section == "experience":
-            return "Experience"
-        elif best_section == "education":
-            return "Education"
-        elif best_section == "contact":
-            return "Contact Information"
-        elif best_section == "overview":
-            return "Overview"
-        elif best_section == "technologies":
-            return "Technologies Used"
-        elif best_section == "features":
-            return "Key Features"
-        elif best_section == "challenges":
-            return "Challenges & Solutions"
-        elif best_section == "results":
-            return "Results & Impact"
-        elif best_section == "objectives":
-            return "Learning Objectives"
-        elif best_section == "application":
-            return "Practical Applications"
-        elif best_section == "future":
-            return "Future Learning Goals"
-    
-    return best_section
+    # Convert to the canonical heading (shared with structured output)
+    return sections.SECTION_TITLES.get(best_section, best_section)
 
 def _extract_section_block(content, target_section):
     """Extract a specific section block from generated content"""
@@ -1,31 +1,46 @@
-import os
-from dotenv import load_dotenv
 import json
-from pathlib import Path
-
-# Load environment variables from .env file (for local development)
-load_dotenv()
+import os
+import sys
+import warnings
+from functools import lru_cache
 
-# Try to import streamlit for cloud deployment secrets
 try:
-    import streamlit as st
-    _use_streamlit_secrets = hasattr(st, "secrets")
-except ImportError:
-    _use_streamlit_secrets = False
+    from . import prompt_registry  # type: ignore
+except ImportError:  # when executed without package context
+    import prompt_registry  # type: ignore
+
+# Settings are resolved lazily on first attribute access and memoized, so importing
+# this module stays cheap: python-dotenv is only loaded when a value is first needed,
+# and Streamlit secrets are only consulted when Streamlit is already running.
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load environment variables from .env file (for local development)"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def _streamlit_secrets():
+    """Return st.secrets when running inside Streamlit (cloud deployment), else None"""
+    st = sys.modules.get("streamlit")
+    return getattr(st, "secrets", None) if st is not None else None
+
 
 def _get_config(key: str, default: str = "") -> str:
     """Get configuration from Streamlit secrets (cloud) or environment variables (local)"""
-    if _use_streamlit_secrets:
+    _load_env()
+    secrets = _streamlit_secrets()
+    if secrets is not None:
         try:
-            return str(st.secrets.get(key, os.getenv(key, default)))
+            return str(secrets.get(key, os.getenv(key, default)))
         except Exception:
             pass
     return os.getenv(key, default)
 
-# Model configuration
-MODEL_NAME = _get_config("MODEL_NAME", "gemini-2.0-flash-exp")
-TEMPERATURE = float(_get_config("MODEL_TEMPERATURE", "0.7"))
-
 # Global system prompt for the assistant (applied once per session before any template-specific prompts)
 DEFAULT_GLOBAL_SYSTEM_PROMPT = (
     "You are DevFolio AI. Help users analyze, improve, and generate portfolio content "
@@ -33,24 +48,213 @@ DEFAULT_GLOBAL_SYSTEM_PROMPT = (
     "Always ask for missing details, keep answers structured, and tailor advice to the target role and audience."
 )
 
-def _load_global_system_prompt_from_file() -> str:
+
+@lru_cache(maxsize=None)
+def model_name() -> str:
+    return _get_config("MODEL_NAME", "gemini-2.0-flash-exp")
+
+
+@lru_cache(maxsize=None)
+def temperature() -> float:
+    return float(_get_config("MODEL_TEMPERATURE", "0.7"))
+
+
+@lru_cache(maxsize=None)
+def fast_model_name() -> str:
+    """Cheaper, faster model used for small edits and short replies when routing is on"""
+    return _get_config("FAST_MODEL_NAME", "gemini-2.0-flash-lite")
+
+
+@lru_cache(maxsize=None)
+def model_routing_enabled() -> bool:
+    return _get_config("MODEL_ROUTING", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=None)
+def structured_output() -> bool:
+    """Generate documents as JSON keyed by section, rendered locally and cached per section"""
+    return _get_config("STRUCTURED_OUTPUT", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=None)
+def model_routes() -> dict:
+    """Per-route overrides, e.g. {"section_edit": {"model": "...", "max_output_tokens": 1024}}
+
+    Validated once: a malformed value (or entry) is reported and ignored rather than
+    failing every model call.
+    """
+    raw = _get_config("MODEL_ROUTES", "").strip()
+    if not raw:
+        return {}
     try:
-        # Align with actual file location and name used by the frontend
-        path = Path(__file__).resolve().parent / "systemprompts.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # Expect either {"system_prompt": "..."} or {"prompts": {"global": "..."}}
-            sp = str(data.get("system_prompt") or data.get("global") or "").strip()
-            if sp:
-                return sp
-    except Exception:
-        # Silently fall back to env/default if file is unreadable
-        pass
-    return ""
-
-_file_sp = _load_global_system_prompt_from_file()
-GLOBAL_SYSTEM_PROMPT = (
-    _file_sp
-    or _get_config("GLOBAL_SYSTEM_PROMPT", DEFAULT_GLOBAL_SYSTEM_PROMPT).strip()
-)
+        routes = json.loads(raw)
+    except json.JSONDecodeError as e:
+        warnings.warn(f"MODEL_ROUTES is not valid JSON ({e}); ignoring it")
+        return {}
+    if not isinstance(routes, dict):
+        warnings.warn("MODEL_ROUTES must be a JSON object keyed by route; ignoring it")
+        return {}
+    valid = {}
+    for route, rule in routes.items():
+        if not isinstance(rule, dict):
+            warnings.warn(f"MODEL_ROUTES[{route!r}] must be an object; ignoring it")
+            continue
+        unknown = set(rule) - {"model", "max_output_tokens"}
+        if unknown:
+            warnings.warn(f"MODEL_ROUTES[{route!r}]: unknown keys {sorted(unknown)} ignored")
+        limit = rule.get("max_output_tokens")
+        if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0):
+            warnings.warn(f"MODEL_ROUTES[{route!r}]: max_output_tokens must be a positive integer; ignoring it")
+            continue
+        if "model" in rule and not (isinstance(rule["model"], str) and rule["model"].strip()):
+            warnings.warn(f"MODEL_ROUTES[{route!r}]: model must be a non-empty string; ignoring it")
+            continue
+        valid[route] = {k: v for k, v in rule.items() if k in ("model", "max_output_tokens")}
+    return valid
+
+
+@lru_cache(maxsize=None)
+def generation_skips() -> bool:
+    """Skip/downgrade generations, reuse cached sections and route mode switches from per-process state (off for N API workers)"""
+    return _get_config("GENERATION_SKIPS", "on").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=None)
+def hedge_requests() -> bool:
+    return _get_config("HEDGE_REQUESTS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=None)
+def hedge_delay_ms() -> int:
+    """Hedge threshold used until a route has enough latency samples for its p95"""
+    return int(_get_config("HEDGE_DELAY_MS", "4000"))
+
+
+@lru_cache(maxsize=None)
+def hedge_budget() -> float:
+    """Hedges a session earns per model call (0.1 = at most ~1 extra request per 10)"""
+    return float(_get_config("HEDGE_BUDGET", "0.1"))
+
+
+@lru_cache(maxsize=None)
+def long_input_workers() -> int:
+    """Parallel chunk workers for long pasted inputs (e.g. a full resume)"""
+    return max(1, int(_get_config("LONG_INPUT_WORKERS", "4")))
+
+
+@lru_cache(maxsize=None)
+def context_cache_mode() -> str:
+    """Provider context caching for the stable prompt prefix: off | gemini"""
+    return _get_config("CONTEXT_CACHE", "off").strip().lower()
+
+
+@lru_cache(maxsize=None)
+def context_cache_ttl() -> int:
+    return int(_get_config("CONTEXT_CACHE_TTL", "3600"))
+
+
+@lru_cache(maxsize=None)
+def session_store() -> str:
+    """Where chat history lives: memory (per process) | sqlite (shared by workers on one host)"""
+    return _get_config("SESSION_STORE", "memory").strip().lower()
+
+
+@lru_cache(maxsize=None)
+def session_db_path() -> str:
+    return _get_config("SESSION_DB_PATH", "sessions.db")
+
+
+@lru_cache(maxsize=None)
+def redis_url() -> str:
+    return _get_config("REDIS_URL", "redis://localhost:6379/0")
+
+
+@lru_cache(maxsize=None)
+def session_ttl() -> int:
+    """Seconds an idle session is kept by the redis store"""
+    return int(_get_config("SESSION_TTL", "604800"))
+
+
+@lru_cache(maxsize=None)
+def profiling_enabled() -> bool:
+    return _get_config("DEVFOLIO_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=None)
+def profile_dir() -> str:
+    return _get_config("PROFILE_DIR", "profiles")
+
+
+@lru_cache(maxsize=None)
+def profile_keep() -> int:
+    """Profiled runs whose files each process keeps in PROFILE_DIR (older ones are deleted)"""
+    return max(1, int(_get_config("PROFILE_KEEP", "50")))
+
+
+@lru_cache(maxsize=None)
+def _configured_global_system_prompt() -> str:
+    return _get_config("GLOBAL_SYSTEM_PROMPT", DEFAULT_GLOBAL_SYSTEM_PROMPT).strip()
+
+
+def global_system_prompt() -> str:
+    # systemprompts.json wins; the registry hot-reloads it when the file changes
+    return prompt_registry.global_system_prompt() or _configured_global_system_prompt()
+
+
+# Module-level names kept for compatibility (config.MODEL_NAME etc.), resolved on first access
+_LAZY_SETTINGS = {
+    "MODEL_NAME": model_name,
+    "TEMPERATURE": temperature,
+    "FAST_MODEL_NAME": fast_model_name,
+    "MODEL_ROUTING": model_routing_enabled,
+    "MODEL_ROUTES": model_routes,
+    "STRUCTURED_OUTPUT": structured_output,
+    "GENERATION_SKIPS": generation_skips,
+    "HEDGE_REQUESTS": hedge_requests,
+    "HEDGE_DELAY_MS": hedge_delay_ms,
+    "HEDGE_BUDGET": hedge_budget,
+    "LONG_INPUT_WORKERS": long_input_workers,
+    "GLOBAL_SYSTEM_PROMPT": global_system_prompt,
+    "CONTEXT_CACHE": context_cache_mode,
+    "CONTEXT_CACHE_TTL": context_cache_ttl,
+    "SESSION_STORE": session_store,
+    "SESSION_DB_PATH": session_db_path,
+    "REDIS_URL": redis_url,
+    "SESSION_TTL": session_ttl,
+    "DEVFOLIO_PROFILE": profiling_enabled,
+    "PROFILE_DIR": profile_dir,
+    "PROFILE_KEEP": profile_keep,
+}
+
+
+def __getattr__(name: str):
+    resolver = _LAZY_SETTINGS.get(name)
+    if resolver is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return resolver()
+
+
+def clear_cache() -> None:
+    """Forget memoized settings so the next access re-reads env, secrets and files."""
+    model_name.cache_clear()
+    temperature.cache_clear()
+    fast_model_name.cache_clear()
+    model_routing_enabled.cache_clear()
+    model_routes.cache_clear()
+    structured_output.cache_clear()
+    generation_skips.cache_clear()
+    hedge_requests.cache_clear()
+    hedge_delay_ms.cache_clear()
+    hedge_budget.cache_clear()
+    long_input_workers.cache_clear()
+    context_cache_mode.cache_clear()
+    context_cache_ttl.cache_clear()
+    session_store.cache_clear()
+    session_db_path.cache_clear()
+    redis_url.cache_clear()
+    session_ttl.cache_clear()
+    profiling_enabled.cache_clear()
+    profile_dir.cache_clear()
+    profile_keep.cache_clear()
+    _configured_global_system_prompt.cache_clear()
+    _load_env.cache_clear()
@@ -0,0 +1,186 @@
+"""
+Per-session version history for the generated document.
+
+Only the newest version is kept in full. Each older version is stored as a
+line-level reverse delta against the version after it, plus a full keyframe
+every `keyframe_every` versions to bound reconstruction cost, so memory grows
+with the size of the edits rather than the size of the document.
+"""
+
+import difflib
+import re
+from typing import Any, Dict, Tuple
+
+# A delta is a tuple of (start, end, replacement_lines) hunks against the source lines
+Delta = Tuple[Tuple[int, int, Tuple[str, ...]], ...]
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def make_delta(source: list[str], target: list[str]) -> Delta:
+    """Hunks that turn `source` lines into `target` lines."""
+    matcher = difflib.SequenceMatcher(a=source, b=target, autojunk=False)
+    return tuple(
+        (i1, i2, tuple(target[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    )
+
+
+def apply_delta(source: list[str], delta: Delta) -> list[str]:
+    out: list[str] = []
+    pos = 0
+    for start, end, lines in delta:
+        out.extend(source[pos:start])
+        out.extend(lines)
+        pos = end
+    out.extend(source[pos:])
+    return out
+
+
+class VersionStore:
+    """Undo/redo history of a document, newest version stored in full."""
+
+    def __init__(self, initial: str = "", keyframe_every: int = 32, max_versions: int = 200):
+        self.keyframe_every = keyframe_every
+        self.max_versions = max_versions
+        self._latest = initial
+        self._latest_lines = initial.split("\n")
+        # _back[i] rebuilds version i from version i + 1 (or is a full keyframe)
+        self._back: list[Delta | Tuple[str, ...]] = []
+        # Versions ever committed; keyframes are scheduled on it because len(_back)
+        # stops growing once max_versions trimming starts
+        self._committed = 0
+        self._cursor = 0
+        self._cursor_text = initial
+
+    def __len__(self) -> int:
+        return len(self._back) + 1
+
+    @property
+    def latest(self) -> str:
+        return self._latest
+
+    @property
+    def current(self) -> str:
+        """Version at the undo cursor (the latest unless the user has undone)."""
+        return self._cursor_text
+
+    @property
+    def index(self) -> int:
+        return self._cursor
+
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    def can_redo(self) -> bool:
+        return self._cursor < len(self._back)
+
+    def get(self, index: int) -> str:
+        """Reconstruct any version (0 = oldest, -1 = latest)."""
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"version {index} out of range (0..{n - 1})")
+        if index == n - 1:
+            return self._latest
+        if index == self._cursor:
+            return self._cursor_text
+        # Start from the nearest keyframe at or after `index`, or from the latest version
+        start, lines = n - 1, self._latest_lines
+        for i in range(index, n - 1):
+            entry = self._back[i]
+            if entry and isinstance(entry[0], str):
+                start, lines = i, list(entry)
+                break
+        for i in range(start - 1, index - 1, -1):
+            entry = self._back[i]
+            lines = list(entry) if entry and isinstance(entry[0], str) else apply_delta(lines, entry)
+        return "\n".join(lines)
+
+    def commit(self, content: str) -> bool:
+        """Record a new version; anything that was undone is discarded. False if unchanged."""
+        if content == self._cursor_text:
+            return False
+        if self._cursor < len(self._back):
+            # Drop the redo branch: the version at the cursor becomes the latest
+            del self._back[self._cursor:]
+            self._latest = self._cursor_text
+            self._latest_lines = self._latest.split("\n")
+        new_lines = content.split("\n")
+        self._committed += 1
+        if self.keyframe_every and self._committed % self.keyframe_every == 0:
+            self._back.append(tuple(self._latest_lines))
+        else:
+            self._back.append(make_delta(new_lines, self._latest_lines))
+        self._latest = content
+        self._latest_lines = new_lines
+        if len(self._back) + 1 > self.max_versions:
+            # Oldest versions fall off; their deltas only refer to newer versions
+            drop = len(self._back) + 1 - self.max_versions
+            del self._back[:drop]
+        self._cursor = len(self._back)
+        self._cursor_text = content
+        return True
+
+    def undo(self) -> str:
+        if self.can_undo():
+            self._cursor_text = self.get(self._cursor - 1)
+            self._cursor -= 1
+        return self._cursor_text
+
+    def redo(self) -> str:
+        if self.can_redo():
+            self._cursor_text = self.get(self._cursor + 1)
+            self._cursor += 1
+        return self._cursor_text
+
+    def stored_chars(self) -> int:
+        """Characters held by the store, for memory accounting."""
+        total = len(self._latest)
+        for entry in self._back:
+            if entry and isinstance(entry[0], str):
+                total += sum(len(line) for line in entry)
+            else:
+                total += sum(len(line) for _s, _e, lines in entry for line in lines)
+        return total
+
+
+def split_sections(content: str) -> Dict[str, str]:
+    """Markdown split by headings: {heading text: section body}, preamble under ""."""
+    sections: Dict[str, list[str]] = {"": []}
+    current = ""
+    for line in content.split("\n"):
+        m = _HEADING_RE.match(line)
+        if m:
+            current = m.group(2).strip()
+            # Repeated headings (e.g. "### Project 1" twice) get a numeric suffix
+            base, n = current, 2
+            while current in sections:
+                current = f"{base} ({n})"
+                n += 1
+            sections[current] = [line]
+        else:
+            sections[current].append(line)
+    return {k: "\n".join(v).strip("\n") for k, v in sections.items() if k or "\n".join(v).strip()}
+
+
+def section_diff(old: str, new: str) -> list[Dict[str, Any]]:
+    """Per-section changes between two versions (added / removed / changed)."""
+    old_sections = split_sections(old)
+    new_sections = split_sections(new)
+    changes: list[Dict[str, Any]] = []
+    for name, body in new_sections.items():
+        if name not in old_sections:
+            changes.append({"section": name or "(preamble)", "status": "added", "diff": ""})
+        elif old_sections[name] != body:
+            # Skip the "---"/"+++" file header lines
+            diff = "\n".join(list(difflib.unified_diff(
+                old_sections[name].split("\n"), body.split("\n"), lineterm="", n=1,
+            ))[2:])
+            changes.append({"section": name or "(preamble)", "status": "changed", "diff": diff})
+    for name in old_sections:
+        if name not in new_sections:
+            changes.append({"section": name or "(preamble)", "status": "removed", "diff": ""})
+    return changes
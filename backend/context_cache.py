@@ -0,0 +1,160 @@
+"""
+Provider-side context caching for the stable prompt prefix.
+
+chat_core sends the global and mode system prompts as a byte-stable prefix. With
+CONTEXT_CACHE=gemini that prefix is stored once as a Gemini cached content and
+referenced by name on later calls. LocalContextCache is an in-process stand-in
+with the same interface for tests: install it with set_backend() together with a
+stubbed model, since its cache names mean nothing to the real provider.
+Token usage reported by the provider is aggregated into cached vs uncached input.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict
+
+try:
+    from . import config  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+
+
+def prefix_key(model: str, parts: list[str]) -> str:
+    """Stable identifier for a model + prefix combination."""
+    h = hashlib.sha256(model.encode("utf-8"))
+    for part in parts:
+        h.update(b"\x00")
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+class LocalContextCache:
+    """In-process stand-in for the provider cache API (create, lookup, TTL); tests only, via set_backend()."""
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _create(self, key: str, model: str, parts: list[str]) -> str | None:
+        return f"cachedContents/local-{key[:16]}"
+
+    def get_or_create(self, model: str, parts: list[str]) -> str | None:
+        """Return a cache name for this prefix, creating it if needed (None if uncachable)."""
+        key = prefix_key(model, parts)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        name = self._create(key, model, parts)
+        with self._lock:
+            # Uncachable prefixes are remembered too, so we don't retry on every call
+            self._entries[key] = (name or "", now + self.ttl_seconds)
+        return name or None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class GeminiContextCache(LocalContextCache):
+    """Explicit Gemini context caching via google-genai's caches API."""
+
+    def __init__(self, ttl_seconds: int = 3600, client: Any = None):
+        super().__init__(ttl_seconds)
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        return self._client
+
+    def _create(self, key: str, model: str, parts: list[str]) -> str | None:
+        from google.genai import types
+        try:
+            cache = self._get_client().caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    display_name=f"devfolio-{key[:12]}",
+                    system_instruction="\n\n".join(parts),
+                    ttl=f"{self.ttl_seconds}s",
+                ),
+            )
+        except Exception:
+            # E.g. prefix below the provider's minimum cacheable size: send it inline
+            return None
+        return cache.name
+
+
+_BACKEND: LocalContextCache | None = None
+_OVERRIDE: LocalContextCache | None = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_backend() -> LocalContextCache | None:
+    """Cache backend selected by CONTEXT_CACHE (off | gemini), or the one installed by set_backend()."""
+    global _BACKEND
+    if _OVERRIDE is not None:
+        return _OVERRIDE
+    if config.CONTEXT_CACHE != "gemini":
+        return None
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = GeminiContextCache(ttl_seconds=config.CONTEXT_CACHE_TTL)
+        return _BACKEND
+
+
+def set_backend(backend: LocalContextCache | None) -> None:
+    """Force a specific backend regardless of CONTEXT_CACHE (None restores the setting)."""
+    global _OVERRIDE
+    _OVERRIDE = backend
+
+
+_USAGE_LOCK = threading.Lock()
+_USAGE: Dict[str, int] = {}
+
+
+def _empty_usage() -> Dict[str, int]:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "cached_input_tokens": 0,
+        "uncached_input_tokens": 0,
+        "output_tokens": 0,
+    }
+
+
+def record_usage(usage_metadata: Dict[str, Any] | None) -> None:
+    """Accumulate LangChain usage_metadata from a model response."""
+    usage_metadata = usage_metadata or {}
+    input_tokens = int(usage_metadata.get("input_tokens") or 0)
+    cached = int((usage_metadata.get("input_token_details") or {}).get("cache_read") or 0)
+    with _USAGE_LOCK:
+        if not _USAGE:
+            _USAGE.update(_empty_usage())
+        _USAGE["calls"] += 1
+        _USAGE["input_tokens"] += input_tokens
+        _USAGE["cached_input_tokens"] += cached
+        _USAGE["uncached_input_tokens"] += max(input_tokens - cached, 0)
+        _USAGE["output_tokens"] += int(usage_metadata.get("output_tokens") or 0)
+
+
+def usage_report() -> Dict[str, Any]:
+    """Totals so far plus the share of input tokens served from cache."""
+    with _USAGE_LOCK:
+        report: Dict[str, Any] = dict(_USAGE or _empty_usage())
+    total = report["input_tokens"]
+    report["cached_ratio"] = round(report["cached_input_tokens"] / total, 3) if total else 0.0
+    return report
+
+
+def reset_usage() -> None:
+    with _USAGE_LOCK:
+        _USAGE.clear()
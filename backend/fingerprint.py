@@ -0,0 +1,156 @@
+"""
+Generation fingerprints: skip or downgrade model calls that would add nothing.
+
+A fingerprint covers (session, mode, normalized profile, salient input), where
+the salient input is the user's text without small talk and stopwords. Before a
+generation, decide() compares it with what this session last generated:
+
+    skip       nothing salient and the profile is unchanged, or this exact
+               fingerprint was already generated: reuse the stored document
+    downgrade  only a few salient words and the profile is unchanged: a cheap
+               section-edit call is enough
+    generate   anything else
+
+Documents are kept per fingerprint and per (session, mode) in bounded LRUs.
+They live in this process only: with several API workers a reset handled by one
+worker would not reach the others, so GENERATION_SKIPS=off makes every decision
+"generate" (the API sets it when started with --workers > 1). chat_core applies
+the same switch to per-section reuse and mode-switch routing.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+try:
+    from . import config  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+
+SKIP = "skip"
+DOWNGRADE = "downgrade"
+GENERATE = "generate"
+
+# Inputs with at most this many salient words (and an unchanged profile) are downgraded
+DOWNGRADE_MAX_WORDS = 6
+MAX_DOCUMENTS = 512
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+# Conversational filler that never changes the document
+SMALL_TALK = frozenset("""
+    hi hello hey hiya yo thanks thank thx ty cheers ok okay k kk cool great nice awesome
+    perfect good fine sure yes yeah yep no nope nah lol haha wow amazing brilliant lovely
+    please pls bye goodbye morning evening afternoon got it sounds right looks look seems
+    like love lgtm exactly indeed
+""".split())
+
+STOPWORDS = frozenset("""
+    a an the and or but so if then than that this these those it its it's is are was were be
+    been being am do does did done have has had having i me my mine we our you your he she
+    they them their to of in on at by for with from as about into over just really very
+    can could would should will shall may might must also too well now again still what
+    which who whom how why when where there here all any some more most much many
+""".split())
+
+
+def salient_input(text: str | None) -> str:
+    """The input's meaningful words in order (lowercased), without filler and stopwords."""
+    if not text:
+        return ""
+    words = _WORD_RE.findall(text.lower())
+    return " ".join(w.strip(".-") for w in words if w.strip(".-") and w not in SMALL_TALK and w not in STOPWORDS)
+
+
+def _hash(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def fingerprint(session_id: str, content_type: str, profile: str, salient: str) -> str:
+    return _hash(session_id, content_type, profile, salient)
+
+
+_LOCK = threading.Lock()
+# (session_id, fingerprint) -> document
+_DOCUMENTS: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+# (session_id, content_type) -> (profile hash, document)
+_LATEST: "OrderedDict[tuple[str, str], tuple[str, str]]" = OrderedDict()
+_DECISIONS: Dict[str, int] = {}
+
+
+def _put(cache: OrderedDict, key: Any, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_DOCUMENTS:
+        cache.popitem(last=False)
+
+
+def decide(
+    session_id: str, content_type: str, profile: str, extra_input: str | None, record: bool = True
+) -> Dict[str, Any]:
+    """{"action", "fingerprint", "salient", "document"} for a prospective generation."""
+    salient = salient_input(extra_input)
+    fp = fingerprint(session_id, content_type, profile, salient)
+    decision: Dict[str, Any] = {"action": GENERATE, "fingerprint": fp, "salient": salient, "document": None}
+    if not config.GENERATION_SKIPS:
+        if record:
+            count(GENERATE)
+        return decision
+    profile_hash = _hash(profile)
+    with _LOCK:
+        document = _DOCUMENTS.get((session_id, fp))
+        latest = _LATEST.get((session_id, content_type))
+    unchanged = latest is not None and latest[0] == profile_hash
+    if document is not None:
+        decision.update(action=SKIP, document=document)
+    elif unchanged and not salient:
+        decision.update(action=SKIP, document=latest[1])
+    elif unchanged and len(salient.split()) <= DOWNGRADE_MAX_WORDS:
+        decision["action"] = DOWNGRADE
+    if record:
+        count(decision["action"])
+    return decision
+
+
+def count(action: str) -> None:
+    with _LOCK:
+        _DECISIONS[action] = _DECISIONS.get(action, 0) + 1
+
+
+def remember(session_id: str, content_type: str, profile: str, fp: str, document: str) -> None:
+    """Record a generated document under its fingerprint and as the session's latest for the mode."""
+    if not document or not document.strip():
+        return
+    with _LOCK:
+        _put(_DOCUMENTS, (session_id, fp), document)
+        _put(_LATEST, (session_id, content_type), (_hash(profile), document))
+
+
+def forget_session(session_id: str) -> None:
+    """Drop a session's stored documents (e.g. when its history is reset)."""
+    with _LOCK:
+        for cache in (_DOCUMENTS, _LATEST):
+            for key in [k for k in cache if k[0] == session_id]:
+                del cache[key]
+
+
+def decision_report() -> Dict[str, Any]:
+    """Decisions taken so far and the share of generations that skipped the model."""
+    with _LOCK:
+        report: Dict[str, Any] = {action: _DECISIONS.get(action, 0) for action in (SKIP, DOWNGRADE, GENERATE)}
+    total = sum(report.values())
+    report["skip_ratio"] = round(report[SKIP] / total, 3) if total else 0.0
+    return report
+
+
+def clear() -> None:
+    with _LOCK:
+        _DOCUMENTS.clear()
+        _LATEST.clear()
+        _DECISIONS.clear()
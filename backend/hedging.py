@@ -0,0 +1,229 @@
+"""
+Hedged model calls to cut tail latency (opt-in with HEDGE_REQUESTS=1).
+
+If a call has not finished (or, when streaming, not produced its first chunk)
+within the route's running p95 latency, a duplicate request is started and
+whichever completes first wins. Each attempt streams on its own thread, so the
+loser is cancelled by closing its stream, which drops the connection. Only the
+winner's response is returned, and chat_core writes history once.
+
+Until a route has HEDGE_MIN_SAMPLES latency samples the threshold is
+HEDGE_DELAY_MS. Each session, and the process as a whole, earns HEDGE_BUDGET
+hedges per call (up to BUDGET_BURST / GLOBAL_BURST); a hedge needs a token from
+both. Sessions start with none, so many short sessions cannot add more than
+HEDGE_BUDGET extra load between them. A gate installed with set_gate() (e.g. the
+batch CLI's rate limiter) must also admit each hedge.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    from . import config  # type: ignore
+    from . import model_router  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+    import model_router  # type: ignore
+
+HEDGE_MIN_SAMPLES = 20
+BUDGET_BURST = 3.0
+GLOBAL_BURST = 10.0
+MAX_TRACKED_SESSIONS = 10000
+
+
+def enabled() -> bool:
+    return config.HEDGE_REQUESTS
+
+
+def threshold_seconds(route: str, first_chunk: bool = False) -> float:
+    """Route p95 (latency or time to first chunk) once known, else HEDGE_DELAY_MS."""
+    p95 = model_router.latency_percentile(route, 0.95, HEDGE_MIN_SAMPLES, first_chunk=first_chunk)
+    return (p95 if p95 is not None else config.HEDGE_DELAY_MS) / 1000
+
+
+# Hedge budgets (token buckets), per session and process-wide: every call earns
+# HEDGE_BUDGET in both, a hedge costs 1 from both. Unseen (or evicted) sessions start empty.
+_BUDGET_LOCK = threading.Lock()
+_BUDGETS: "OrderedDict[str, float]" = OrderedDict()
+_GLOBAL_BUDGET = {"tokens": 0.0}
+_GATE: Callable[[], bool] | None = None
+
+
+def set_gate(gate: Callable[[], bool] | None) -> None:
+    """Extra non-blocking check every hedge must pass (e.g. a shared rate limiter); None removes it."""
+    global _GATE
+    _GATE = gate
+
+
+def _earn(session_id: str) -> None:
+    with _BUDGET_LOCK:
+        tokens = _BUDGETS.pop(session_id, 0.0)
+        _BUDGETS[session_id] = min(BUDGET_BURST, tokens + config.HEDGE_BUDGET)
+        while len(_BUDGETS) > MAX_TRACKED_SESSIONS:
+            _BUDGETS.popitem(last=False)
+        _GLOBAL_BUDGET["tokens"] = min(GLOBAL_BURST, _GLOBAL_BUDGET["tokens"] + config.HEDGE_BUDGET)
+
+
+def _spend(session_id: str) -> bool:
+    with _BUDGET_LOCK:
+        tokens = _BUDGETS.get(session_id, 0.0)
+        if tokens < 1.0 or _GLOBAL_BUDGET["tokens"] < 1.0:
+            return False
+        if _GATE is not None and not _GATE():
+            return False
+        _BUDGETS[session_id] = tokens - 1.0
+        _GLOBAL_BUDGET["tokens"] -= 1.0
+        return True
+
+
+_METRICS_LOCK = threading.Lock()
+_METRICS: Dict[str, Dict[str, int]] = {}
+
+
+def _count(route: str, **increments: int) -> None:
+    with _METRICS_LOCK:
+        entry = _METRICS.setdefault(route, {
+            "calls": 0, "hedged": 0, "hedge_wins": 0, "budget_denied": 0, "cancelled": 0,
+        })
+        for key, n in increments.items():
+            entry[key] += n
+
+
+def hedge_report() -> Dict[str, Dict[str, Any]]:
+    """Per-route hedging counts and the share of calls that were hedged."""
+    with _METRICS_LOCK:
+        report: Dict[str, Dict[str, Any]] = {route: dict(entry) for route, entry in _METRICS.items()}
+    for entry in report.values():
+        entry["hedge_rate"] = round(entry["hedged"] / entry["calls"], 3) if entry["calls"] else 0.0
+    return report
+
+
+def reset_metrics() -> None:
+    with _METRICS_LOCK:
+        _METRICS.clear()
+    with _BUDGET_LOCK:
+        _BUDGETS.clear()
+        _GLOBAL_BUDGET["tokens"] = 0.0
+
+
+class _Attempt:
+    """One streaming request on a daemon thread, reporting (n, kind, payload) events."""
+
+    def __init__(self, n: int, llm: Any, messages: list, kwargs: Dict[str, Any], events: queue.Queue):
+        self.n = n
+        self.cancelled = threading.Event()
+        self.finished = False
+        self._args = (llm, messages, kwargs, events)
+        threading.Thread(target=self._run, name=f"hedge-attempt-{n}", daemon=True).start()
+
+    def _run(self) -> None:
+        llm, messages, kwargs, events = self._args
+        stream = None
+        try:
+            stream = llm.stream(messages, **kwargs)
+            for chunk in stream:
+                if self.cancelled.is_set():
+                    return
+                events.put((self.n, "chunk", chunk))
+            events.put((self.n, "done", None))
+        except Exception as e:
+            events.put((self.n, "error", e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                # Closing the generator releases the underlying HTTP stream
+                close()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+
+def _race(
+    llm: Any,
+    messages: list,
+    kwargs: Dict[str, Any],
+    route: str,
+    session_id: str,
+    first_chunk: bool,
+) -> Iterator[tuple[int, str, Any]]:
+    """Run the primary attempt, hedge it once past the threshold, yield the winner's events.
+
+    With `first_chunk` the first attempt to produce output wins (streaming);
+    otherwise the first to finish wins, and its chunks are yielded only then.
+    """
+    _earn(session_id)
+    _count(route, calls=1)
+    events: queue.Queue = queue.Queue()
+    attempts = [_Attempt(0, llm, messages, kwargs, events)]
+    buffered: Dict[int, list] = {0: []}
+    deadline = time.monotonic() + threshold_seconds(route, first_chunk)
+    hedge_decided = False
+    winner = None
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if not hedge_decided and winner is None else None
+            try:
+                n, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                hedge_decided = True
+                if _spend(session_id):
+                    _count(route, hedged=1)
+                    attempts.append(_Attempt(1, llm, messages, kwargs, events))
+                    buffered[1] = []
+                else:
+                    _count(route, budget_denied=1)
+                continue
+
+            if winner is None:
+                if kind == "error":
+                    # Fail only once no attempt is left that could still succeed
+                    attempts[n].finished = True
+                    if all(a.finished for a in attempts):
+                        raise payload
+                    continue
+                if kind == "chunk" and not first_chunk:
+                    buffered[n].append(payload)
+                    continue
+                # First output (streaming) or first completion wins; cancel the rest
+                winner = n
+                if n == 1:
+                    _count(route, hedge_wins=1)
+                for attempt in attempts:
+                    if attempt.n != n:
+                        attempt.cancel()
+                        _count(route, cancelled=1)
+                for chunk in buffered[n]:
+                    yield n, "chunk", chunk
+                if kind == "done":
+                    return
+                yield n, kind, payload
+                continue
+
+            if n != winner:
+                continue
+            if kind == "done":
+                return
+            if kind == "error":
+                raise payload
+            yield n, kind, payload
+    finally:
+        # Consumer stopped early (or we raised): release every attempt still running
+        for attempt in attempts:
+            attempt.cancel()
+
+
+def invoke(llm: Any, messages: list, kwargs: Dict[str, Any], route: str, session_id: str):
+    """Hedged equivalent of llm.invoke: the aggregated message of the first attempt to finish."""
+    full = None
+    for _n, _kind, chunk in _race(llm, messages, kwargs, route, session_id, first_chunk=False):
+        full = chunk if full is None else full + chunk
+    return full
+
+
+def stream(llm: Any, messages: list, kwargs: Dict[str, Any], route: str, session_id: str) -> Iterator[Any]:
+    """Hedged equivalent of llm.stream: chunks of the first attempt to produce output."""
+    for _n, _kind, chunk in _race(llm, messages, kwargs, route, session_id, first_chunk=True):
+        yield chunk
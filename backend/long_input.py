@@ -0,0 +1,110 @@
+"""
+Map-reduce processing of long pasted inputs (e.g. a multi-page resume).
+
+A long paste is split into paragraph-aligned chunks. Each chunk is handled by a
+worker of one thread pool: local heuristic extraction, then a short model
+summary (the summarize route). The per-chunk profiles are merged into one and
+the summaries are joined into a compact context block, which is sent in place
+of the raw paste, so the generation prompt stays small however long the input.
+Model calls dominate and run concurrently, so wall time drops roughly with
+LONG_INPUT_WORKERS until the chunk count is reached.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+try:
+    from . import chat_core  # type: ignore
+    from . import config  # type: ignore
+    from .profile_extraction import extract_user_info_from_chat, merge_extracted_info  # type: ignore
+except ImportError:  # when executed without package context
+    import chat_core  # type: ignore
+    import config  # type: ignore
+    from profile_extraction import extract_user_info_from_chat, merge_extracted_info  # type: ignore
+
+# Inputs longer than this are processed in chunks
+LONG_INPUT_CHARS = 4000
+CHUNK_CHARS = 3000
+# Upper bound for the context block that replaces the raw paste
+CONTEXT_MAX_CHARS = 2500
+
+SUMMARY_INSTRUCTIONS = (
+    "You condense one part of a resume or career description. List only concrete facts as short "
+    "bullet points: roles with companies and dates, skills and technologies, projects with results "
+    "or metrics, education, certifications. No introduction, no commentary, at most 8 bullets."
+)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def is_long(text: str | None) -> bool:
+    return bool(text) and len(text) > LONG_INPUT_CHARS
+
+
+def split_chunks(text: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """Paragraph-aligned chunks of at most `max_chars` (long paragraphs split by sentence)."""
+    pieces: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            # Hard-wrap anything still too long (e.g. a line without punctuation)
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    chunks: list[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _local_summary(info: Dict[str, Any]) -> str:
+    # Used when the model summary is unavailable: the chunk's extracted facts
+    return chat_core._compact_profile(info)
+
+
+def _process_chunk(chunk: str, summarize: bool) -> tuple[Dict[str, Any], str]:
+    info = extract_user_info_from_chat([{"role": "user", "content": chunk}])
+    summary = ""
+    if summarize:
+        try:
+            summary = chat_core.summarize(chunk, SUMMARY_INSTRUCTIONS).strip()
+        except Exception:
+            summary = ""
+    return info, summary or _local_summary(info)
+
+
+def digest(text: str, workers: int | None = None, summarize: bool = True) -> Dict[str, Any]:
+    """Profile, compact context block and timing for a long input."""
+    start = time.perf_counter()
+    chunks = split_chunks(text)
+    workers = min(workers or config.LONG_INPUT_WORKERS, max(len(chunks), 1))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="long-input") as pool:
+            results = list(pool.map(lambda c: _process_chunk(c, summarize), chunks))
+    else:
+        results = [_process_chunk(c, summarize) for c in chunks]
+
+    profile = merge_extracted_info([info for info, _summary in results])
+    context = "\n".join(summary for _info, summary in results if summary)
+    if len(context) > CONTEXT_MAX_CHARS:
+        context = context[:CONTEXT_MAX_CHARS].rsplit("\n", 1)[0]
+    return {
+        "profile": profile,
+        "context": f"Pasted document ({len(text)} chars, {len(chunks)} parts), condensed:\n{context}",
+        "chunks": len(chunks),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,147 @@
+"""
+Compact chat message records shared by the backend session store and the UI.
+
+Message uses __slots__, interned role strings and integer epoch timestamps
+instead of a dict per message. MessageLog keeps the most recent messages as
+plain text and zlib-compresses the bodies of older ("cold") ones, which are
+decompressed transparently when their content is read.
+
+Both keep the read-only dict interface callers already use (msg.get("role"),
+msg["content"], msg.get("timestamp")).
+"""
+
+import itertools
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Iterator
+
+# Messages closer than this to the end of a log stay uncompressed
+HOT_MESSAGES = 8
+# Bodies shorter than this are not worth compressing
+COMPRESS_MIN_CHARS = 256
+
+# Process-wide message ids (stable keys for UI render caches)
+_ids = itertools.count(1)
+
+
+def _to_epoch(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value:
+        try:
+            return int(datetime.fromisoformat(value).timestamp())
+        except ValueError:
+            pass
+    return int(time.time())
+
+
+class Message:
+    """One chat message: id, interned role, epoch-seconds timestamp, optionally compressed body."""
+
+    __slots__ = ("id", "role", "ts", "_body")
+
+    def __init__(self, role: str, content: str, ts: int | float | str | None = None):
+        self.id = next(_ids)
+        self.role = sys.intern(role)
+        self.ts = _to_epoch(ts)
+        self._body: str | bytes = content
+
+    @classmethod
+    def from_dict(cls, item: dict) -> "Message":
+        return cls(item.get("role", "user"), item.get("content", ""), item.get("timestamp"))
+
+    @property
+    def content(self) -> str:
+        body = self._body
+        if isinstance(body, bytes):
+            return zlib.decompress(body).decode("utf-8")
+        return body
+
+    @property
+    def compressed(self) -> bool:
+        return isinstance(self._body, bytes)
+
+    def compress(self) -> None:
+        """Compress the body in place if it is large enough to benefit."""
+        body = self._body
+        if isinstance(body, str) and len(body) >= COMPRESS_MIN_CHARS:
+            packed = zlib.compress(body.encode("utf-8"))
+            if len(packed) < len(body):
+                self._body = packed
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.ts).isoformat(timespec="seconds")
+
+    # Read-only dict compatibility
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        if key == "timestamp":
+            return self.timestamp
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in ("role", "content", "timestamp"):
+            raise KeyError(key)
+        return self.get(key)
+
+    def to_dict(self) -> dict:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+    def __repr__(self) -> str:
+        state = "compressed" if self.compressed else f"{len(self._body)} chars"
+        return f"Message({self.id}, {self.role!r}, {state}, ts={self.ts})"
+
+
+class MessageLog:
+    """Append-only list of Messages that compresses bodies once they go cold."""
+
+    __slots__ = ("_items", "hot")
+
+    def __init__(self, items: Any = (), hot: int = HOT_MESSAGES):
+        self._items: list[Message] = []
+        self.hot = hot
+        for item in items:
+            self.append(item)
+
+    def append(self, message: "Message | dict | str", content: str | None = None, ts: Any = None) -> Message:
+        """Append a Message, a message dict, or (role, content[, ts])."""
+        if isinstance(message, Message):
+            msg = message
+        elif isinstance(message, dict):
+            msg = Message.from_dict(message)
+        else:
+            msg = Message(message, content or "", ts)
+        self._items.append(msg)
+        if len(self._items) > self.hot:
+            self._items[-self.hot - 1].compress()
+        return msg
+
+    def trim(self, max_len: int) -> None:
+        """Keep only the newest `max_len` messages."""
+        if len(self._items) > max_len:
+            del self._items[:-max_len]
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        # Slices return plain lists, like slicing the old list of dicts
+        return self._items[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def to_dicts(self) -> list[dict]:
+        return [m.to_dict() for m in self._items]
@@ -0,0 +1,191 @@
+"""
+Model routing by request type.
+
+chat_core classifies every call into a route and asks this module which model
+and output-token limit to use:
+
+    full_generation  first document for a profile, or a broad change
+    section_edit     short request aimed at one section ("add Docker to my skills")
+    mode_switch      regenerate in another mode from a profile already generated
+    short_reply      short free-form chat turn expecting a short answer
+    chat             longer free-form chat turn
+    summarize        one-shot summary of a chunk of pasted text (no history)
+
+With MODEL_ROUTING off (default) every route uses MODEL_NAME with no output
+limit; routes and metrics are still recorded. When on, small edits and short
+replies go to FAST_MODEL_NAME. MODEL_ROUTES (JSON) overrides any route's
+"model" and "max_output_tokens".
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict
+
+try:
+    from . import config  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+
+FULL_GENERATION = "full_generation"
+SECTION_EDIT = "section_edit"
+MODE_SWITCH = "mode_switch"
+SHORT_REPLY = "short_reply"
+CHAT = "chat"
+SUMMARIZE = "summarize"
+ROUTES = (FULL_GENERATION, SECTION_EDIT, MODE_SWITCH, SHORT_REPLY, CHAT, SUMMARIZE)
+
+# Inputs up to this length that target one section count as section edits
+SECTION_EDIT_MAX_CHARS = 200
+# Free-form chat inputs up to this length (that don't ask for a long answer) count as short replies
+SHORT_REPLY_MAX_CHARS = 280
+# Latency samples kept per route for percentiles
+LATENCY_SAMPLES = 500
+MAX_TRACKED_PROFILES = 256
+
+
+def default_rules() -> Dict[str, Dict[str, Any]]:
+    main, fast = config.MODEL_NAME, config.FAST_MODEL_NAME
+    return {
+        FULL_GENERATION: {"model": main, "max_output_tokens": None},
+        # Same profile, different framing: the full document is still regenerated
+        MODE_SWITCH: {"model": main, "max_output_tokens": 4096},
+        SECTION_EDIT: {"model": fast, "max_output_tokens": 4096},
+        # A safety margin rather than a target: a misclassified turn is not cut off mid-answer
+        SHORT_REPLY: {"model": fast, "max_output_tokens": 2048},
+        CHAT: {"model": main, "max_output_tokens": None},
+        SUMMARIZE: {"model": fast, "max_output_tokens": 512},
+    }
+
+
+def resolve(route: str) -> Dict[str, Any]:
+    """{"model", "max_output_tokens"} for a route under the current configuration."""
+    if not config.MODEL_ROUTING:
+        return {"model": config.MODEL_NAME, "max_output_tokens": None}
+    rules = default_rules()
+    rule = dict(rules.get(route, rules[FULL_GENERATION]))
+    rule.update(config.MODEL_ROUTES.get(route) or {})
+    return rule
+
+
+# (conversation, profile hash) pairs that already produced a document in some mode.
+# A conversation is the session id without its per-mode suffix (see chat_core).
+_PROFILES_LOCK = threading.Lock()
+_PROFILES: "OrderedDict[tuple[str, str], None]" = OrderedDict()
+
+
+def _profile_key(conversation_id: str, profile: str) -> tuple[str, str]:
+    return conversation_id, hashlib.sha256(profile.encode("utf-8")).hexdigest()
+
+
+def profile_generated(conversation_id: str, profile: str) -> bool:
+    """True if this conversation already generated a document from exactly this profile."""
+    with _PROFILES_LOCK:
+        return _profile_key(conversation_id, profile) in _PROFILES
+
+
+def remember_profile(conversation_id: str, profile: str) -> None:
+    key = _profile_key(conversation_id, profile)
+    with _PROFILES_LOCK:
+        _PROFILES[key] = None
+        _PROFILES.move_to_end(key)
+        while len(_PROFILES) > MAX_TRACKED_PROFILES:
+            _PROFILES.popitem(last=False)
+
+
+def forget_conversation(conversation_id: str) -> None:
+    with _PROFILES_LOCK:
+        for key in [k for k in _PROFILES if k[0] == conversation_id]:
+            del _PROFILES[key]
+
+
+_METRICS_LOCK = threading.Lock()
+_METRICS: Dict[str, Dict[str, Any]] = {}
+
+
+def _empty_metrics() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "models": {},
+        "latency": deque(maxlen=LATENCY_SAMPLES),
+        "first_chunk": deque(maxlen=LATENCY_SAMPLES),
+    }
+
+
+def record(
+    route: str,
+    model: str,
+    seconds: float,
+    usage_metadata: Dict[str, Any] | None = None,
+    first_chunk_seconds: float | None = None,
+    error: bool = False,
+) -> None:
+    """Account one model call (latency, tokens, model used) under its route."""
+    usage_metadata = usage_metadata or {}
+    with _METRICS_LOCK:
+        entry = _METRICS.get(route)
+        if entry is None:
+            entry = _METRICS[route] = _empty_metrics()
+        entry["calls"] += 1
+        entry["models"][model] = entry["models"].get(model, 0) + 1
+        if error:
+            entry["errors"] += 1
+            return
+        entry["latency"].append(seconds)
+        if first_chunk_seconds is not None:
+            entry["first_chunk"].append(first_chunk_seconds)
+        entry["input_tokens"] += int(usage_metadata.get("input_tokens") or 0)
+        entry["output_tokens"] += int(usage_metadata.get("output_tokens") or 0)
+
+
+def _percentile_ms(samples: list[float], q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+
+
+def latency_percentile(route: str, q: float = 0.95, min_samples: int = 1, first_chunk: bool = False) -> float | None:
+    """Recent latency (or time-to-first-chunk) percentile for a route in milliseconds.
+
+    None until the route has at least `min_samples` samples.
+    """
+    with _METRICS_LOCK:
+        entry = _METRICS.get(route)
+        samples = list(entry["first_chunk" if first_chunk else "latency"]) if entry else []
+    if len(samples) < max(min_samples, 1):
+        return None
+    return _percentile_ms(samples, q)
+
+
+def route_report() -> Dict[str, Dict[str, Any]]:
+    """Per-route calls, errors, latency percentiles, token totals and models used."""
+    with _METRICS_LOCK:
+        snapshot = {
+            route: dict(entry, latency=list(entry["latency"]), first_chunk=list(entry["first_chunk"]),
+                        models=dict(entry["models"]))
+            for route, entry in _METRICS.items()
+        }
+    report: Dict[str, Dict[str, Any]] = {}
+    for route, entry in snapshot.items():
+        ok = entry["calls"] - entry["errors"]
+        report[route] = {
+            "calls": entry["calls"],
+            "errors": entry["errors"],
+            "models": entry["models"],
+            "p50_ms": _percentile_ms(entry["latency"], 0.5),
+            "p95_ms": _percentile_ms(entry["latency"], 0.95),
+            "first_chunk_p50_ms": _percentile_ms(entry["first_chunk"], 0.5),
+            "input_tokens": entry["input_tokens"],
+            "output_tokens": entry["output_tokens"],
+            "avg_output_tokens": round(entry["output_tokens"] / ok, 1) if ok else 0.0,
+        }
+    return report
+
+
+def reset_metrics() -> None:
+    with _METRICS_LOCK:
+        _METRICS.clear()
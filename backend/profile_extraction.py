@@ -0,0 +1,289 @@
+"""
+Heuristic profile extraction from chat messages and a local README fallback.
+
+Shared by the Streamlit app and offline tools (no Streamlit dependency).
+"""
+
+import re
+from collections import OrderedDict
+
+# Constants for maintainability
+MAX_ANALYSIS_MESSAGES = 20
+LOCATION_CONTEXT_WINDOW = 50
+
+def extract_user_info_from_chat(messages):
+    """Extract key information from chat history with safer, heuristic parsing"""
+    extracted_info = {
+        "name": "",
+        "title": "",
+        "contact": {},
+        "technologies": [],
+        "experience": {},
+        "education": [],
+        "projects": [],
+        "skills": {},
+        "achievements": [],
+        "certifications": []
+    }
+
+    # Analyze recent messages for information
+    recent_messages = messages[-MAX_ANALYSIS_MESSAGES:]
+
+    full_text = " ".join([msg.get("content", "") for msg in recent_messages if msg.get("role") == "user"]) or ""
+    full_text_lower = full_text.lower()
+
+    # Extract name (prefer anchored phrases)
+    name = ""
+    anchored_patterns = [
+        r"\bmy name is\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
+        r"\bi am\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
+        r"\bi'm\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
+    ]
+    for pat in anchored_patterns:
+        m = re.search(pat, full_text)
+        if m:
+            candidate = m.group(1).strip()
+            name = candidate
+            break
+    if not name:
+        # Fallback: capture first capitalized pair not containing common role words
+        m = re.search(r"\b([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b", full_text)
+        if m:
+            candidate = m.group(1)
+            if not re.search(r"\b(Engineer|Developer|Manager|Senior|Lead|Principal)\b", candidate):
+                name = candidate
+    if name:
+        extracted_info["name"] = name
+
+    # Extract title/role with prioritization
+    role_keywords = OrderedDict([
+        ("level", ["principal", "staff", "lead", "senior", "jr", "junior"]),
+        ("role", ["full stack", "full-stack", "fullstack", "frontend", "front-end", "front end", "backend", "back-end", "back end", "devops", "sre", "infrastructure", "data scientist", "data engineer", "data analyst"]),
+        ("noun", ["developer", "engineer", "programmer", "coder"])])
+
+    detected = {k: None for k in role_keywords}
+    for k, words in role_keywords.items():
+        for w in words:
+            if re.search(rf"\b{re.escape(w)}\b", full_text_lower):
+                detected[k] = w
+                break
+    title_parts = []
+    if detected["level"]:
+        title_parts.append(detected["level"].title().replace("Jr", "Junior"))
+    if detected["role"]:
+        role = detected["role"].title().replace("Full stack", "Full-Stack")
+        title_parts.append(role)
+    if detected["noun"]:
+        title_parts.append(detected["noun"].title())
+    if title_parts:
+        extracted_info["title"] = " ".join(OrderedDict.fromkeys(title_parts))
+
+    # Extract contact information
+    email_match = re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", full_text)
+    if email_match:
+        extracted_info["contact"]["email"] = email_match.group(0)
+
+    phone_match = re.search(r"\b(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4})\b", full_text)
+    if phone_match:
+        extracted_info["contact"]["phone"] = phone_match.group(0)
+
+    # Extract location
+    for indicator in ["based in", "located in", "from", "living in"]:
+        idx = full_text_lower.find(indicator)
+        if idx != -1:
+            location_text = full_text[idx + len(indicator): idx + len(indicator) + LOCATION_CONTEXT_WINDOW]
+            candidate = location_text.split('.')[0].split(',')[0].strip()
+            if candidate and len(candidate.split()) <= 5:
+                extracted_info["contact"]["location"] = candidate
+                break
+
+    # Extract technologies with categories using word boundaries
+    tech_categories = {
+        "frontend": ["react", "vue", "angular", "typescript", "javascript", "html", "css", "sass", "bootstrap", "tailwind"],
+        "backend": ["node", "python", "java", "spring", "express", "django", "flask", "fastapi", "ruby", "php"],
+        "database": ["mongodb", "postgresql", "mysql", "redis", "sql", "oracle", "dynamodb"],
+        "cloud": ["aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd"],
+        "tools": ["git", "github", "gitlab", "jest", "webpack", "figma", "jira", "confluence"]
+    }
+    tech_flat = []
+    for category, techs in tech_categories.items():
+        extracted_info["skills"][category] = []
+        for tech in techs:
+            # ci/cd special-case word boundary
+            pattern = r"\b" + re.escape(tech) + r"\b" if tech != "ci/cd" else r"\bci/?cd\b"
+            if re.search(pattern, full_text_lower):
+                label = tech.upper() if tech in {"aws", "gcp"} else tech.title()
+                extracted_info["skills"][category].append(label)
+                tech_flat.append(label)
+    # Dedup while preserving order
+    extracted_info["technologies"] = list(OrderedDict.fromkeys(tech_flat))
+
+    # Extract experience years with constrained patterns
+    years_match = re.search(r"\b(\d{1,2})\+?\s*(years?|yrs?)\b", full_text_lower)
+    if years_match:
+        extracted_info["experience"]["years"] = years_match.group(1)
+
+    # Extract company names heuristically
+    companies = []
+    for indicator in ["worked at", "currently at", "at", "employed at", "with"]:
+        for m in re.finditer(rf"\b{indicator}\b\s+([A-Za-z][A-Za-z&\-\s]{1,40})", full_text_lower):
+            cand = m.group(1).strip().split('.')[0].split(',')[0]
+            # Reject if too long or contains digits
+            if 1 < len(cand.split()) <= 4 and not re.search(r"\d", cand):
+                companies.append(cand.title())
+    if companies:
+        extracted_info["experience"]["companies"] = list(OrderedDict.fromkeys(companies))[:5]
+
+    # Extract education (simple sentence-bound, trimmed)
+    education_hits = []
+    for indicator in ["university", "college", "bachelor", "master", "phd", "degree", "graduated"]:
+        for m in re.finditer(rf"\b.{0,60}{indicator}.{{0,60}}", full_text_lower):
+            snippet = full_text[m.start():m.end()]
+            education_hits.append(snippet.strip().split('\n')[0])
+    if education_hits:
+        norm = list(OrderedDict.fromkeys([e.strip().capitalize() for e in education_hits]))
+        extracted_info["education"] = norm[:3]
+
+    # Extract projects/achievements/certs with basic thresholds
+    def split_sentences(text: str):
+        return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
+
+    sentences = split_sentences(full_text)
+
+    for s in sentences:
+        s_low = s.lower()
+        if any(t in s_low for t in ["project", "built", "created", "developed", "implemented"]) and len(s) > 30:
+            extracted_info["projects"].append(s)
+        if any(t in s_low for t in ["achieved", "accomplished", "award", "recognition", "success", "led", "managed"]) and len(s) > 20:
+            extracted_info["achievements"].append(s)
+        if any(t in s_low for t in ["certified", "certification", "aws", "google cloud", "azure"]) and len(s) > 10:
+            extracted_info["certifications"].append(s)
+
+    # Clean up lists and cap sizes
+    for key, cap in [("projects", 5), ("achievements", 5), ("certifications", 5)]:
+        if extracted_info[key]:
+            extracted_info[key] = list(OrderedDict.fromkeys(extracted_info[key]))[:cap]
+
+    return extracted_info
+
+def merge_extracted_info(infos):
+    """Merge profiles extracted from separate texts (e.g. chunks of one resume), earlier ones first"""
+    merged = extract_user_info_from_chat([])
+    years = []
+    companies = []
+    for info in infos:
+        for key in ("name", "title"):
+            if not merged[key] and info.get(key):
+                merged[key] = info[key]
+        for key, value in (info.get("contact") or {}).items():
+            if value and not merged["contact"].get(key):
+                merged["contact"][key] = value
+        for category, skills in (info.get("skills") or {}).items():
+            merged["skills"][category] = list(OrderedDict.fromkeys(merged["skills"].get(category, []) + skills))
+        experience = info.get("experience") or {}
+        if str(experience.get("years", "")).isdigit():
+            years.append(int(experience["years"]))
+        companies.extend(experience.get("companies", []))
+        for key in ("technologies", "education", "projects", "achievements", "certifications"):
+            merged[key].extend(info.get(key) or [])
+    if years:
+        merged["experience"]["years"] = str(max(years))
+    if companies:
+        merged["experience"]["companies"] = list(OrderedDict.fromkeys(companies))[:5]
+    # Same caps as a single extraction
+    for key, cap in [("technologies", None), ("education", 3), ("projects", 5), ("achievements", 5), ("certifications", 5)]:
+        merged[key] = list(OrderedDict.fromkeys(merged[key]))[:cap]
+    return merged
+
+def create_comprehensive_fallback(mode, extracted_info):
+    """Create comprehensive fallback content"""
+    
+    content_parts = []
+    
+    # Header with name and title
+    if extracted_info["name"] and extracted_info["title"]:
+        content_parts.append(f"# {extracted_info['name']} - {extracted_info['title']}")
+    elif extracted_info["name"]:
+        content_parts.append(f"# {extracted_info['name']}")
+    elif extracted_info["title"]:
+        content_parts.append(f"# Professional Profile - {extracted_info['title']}")
+    else:
+        content_parts.append("# Professional Profile")
+    
+    content_parts.append("")
+    
+    # Contact section
+    if extracted_info["contact"]:
+        content_parts.append("## Contact")
+        for key, value in extracted_info["contact"].items():
+            if value:
+                content_parts.append(f"- **{key.title()}**: {value}")
+        content_parts.append("")
+    
+    # Summary section
+    content_parts.append("## Professional Summary")
+    summary = f"Experienced professional"
+    if extracted_info["experience"].get("years"):
+        summary += f" with {extracted_info['experience']['years']} years of experience"
+    if extracted_info["technologies"]:
+        summary += f" specializing in {', '.join(extracted_info['technologies'][:5])}"
+    summary += ". Proven track record of delivering successful projects and solutions."
+    content_parts.append(summary)
+    content_parts.append("")
+    
+    # Technical Skills
+    if extracted_info["skills"]:
+        content_parts.append("## Technical Skills")
+        for category, skills in extracted_info["skills"].items():
+            if skills:
+                content_parts.append(f"- **{category.title()}**: {', '.join(skills)}")
+        content_parts.append("")
+    elif extracted_info["technologies"]:
+        content_parts.append("## Technical Skills")
+        content_parts.append("- " + "\n- ".join(extracted_info["technologies"][:15]))
+        content_parts.append("")
+    
+    # Professional Experience
+    if extracted_info["experience"].get("companies") or extracted_info["experience"].get("years"):
+        content_parts.append("## Professional Experience")
+        if extracted_info["experience"].get("companies"):
+            for company in extracted_info["experience"]["companies"][:3]:
+                content_parts.append(f"### {extracted_info['title'] or 'Professional'} | {company}")
+                content_parts.append("- Contributed to various projects and initiatives")
+                content_parts.append("- Collaborated with team members on development tasks")
+                content_parts.append("- Applied technical skills to solve business problems")
+                content_parts.append("")
+        else:
+            content_parts.append(f"{extracted_info['experience'].get('years', 'Several')} years of professional experience in relevant roles.")
+            content_parts.append("")
+    
+    # Education
+    if extracted_info["education"]:
+        content_parts.append("## Education")
+        for edu in extracted_info["education"][:3]:
+            content_parts.append(f"- {edu}")
+        content_parts.append("")
+    
+    # Projects
+    if extracted_info["projects"]:
+        content_parts.append("## Projects")
+        for i, project in enumerate(extracted_info["projects"][:4], 1):
+            content_parts.append(f"### Project {i}")
+            content_parts.append(f"{project}")
+            content_parts.append("")
+    
+    # Achievements
+    if extracted_info["achievements"]:
+        content_parts.append("## Achievements")
+        for achievement in extracted_info["achievements"][:5]:
+            content_parts.append(f"- {achievement}")
+        content_parts.append("")
+    
+    # Certifications
+    if extracted_info["certifications"]:
+        content_parts.append("## Certifications")
+        for cert in extracted_info["certifications"][:5]:
+            content_parts.append(f"- {cert}")
+        content_parts.append("")
+    
+    return "\n".join(content_parts)
@@ -0,0 +1,237 @@
+"""
+Opt-in profiling for Streamlit reruns and chat_core calls.
+
+Enable with DEVFOLIO_PROFILE=1 (or ?profile=1 in the app URL). Each profiled
+rerun (or standalone backend call outside a rerun) is run under cProfile and
+tracemalloc and written to PROFILE_DIR as:
+
+    <name>.prof       pstats dump (snakeviz, pstats, flameprof)
+    <name>.collapsed  folded stacks, one "a;b;c <microseconds>" per line, for
+                      flamegraph.pl / speedscope / inferno
+    <name>.json       timing sections, top functions and memory summary
+
+Each process keeps the files of its last PROFILE_KEEP runs and deletes older
+ones, so a long-running deployment (or visitors using ?profile=1) cannot fill
+the disk.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+try:
+    from . import config  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+
+_local = threading.local()
+_counter_lock = threading.Lock()
+_counter = 0
+# File groups written by this process, oldest first
+_written: "deque[list[str]]" = deque()
+
+
+def enabled() -> bool:
+    return config.DEVFOLIO_PROFILE
+
+
+def _func_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are reported as ('~', 0, '<built-in method ...>')
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64, resolution: float = 1e-4) -> list[str]:
+    """Approximate folded stacks from cProfile's caller graph.
+
+    cProfile keeps per-edge cumulative times rather than full stacks, so each
+    callee's time is split across its callers in proportion to the edge times.
+    Branches worth less than `resolution` of the total time are dropped, which
+    keeps the number of paths bounded on large call graphs.
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+    roots = [f for f, (_cc, _nc, _tt, _ct, callers) in raw.items() if not callers]
+    min_share = max(1e-6, sum(v[2] for v in raw.values()) * resolution)
+
+    folded: Dict[str, float] = {}
+    # Iterative DFS: (function, share of its cumulative time, path labels, functions on path)
+    stack = [(root, raw[root][3], (), frozenset([root])) for root in roots]
+    while stack:
+        func, share, path, on_path = stack.pop()
+        _cc, _nc, tt, ct, _callers = raw[func]
+        path = path + (_func_label(func),)
+        scale = share / ct if ct else 0.0
+        key = ";".join(path)
+        folded[key] = folded.get(key, 0.0) + tt * scale
+        if len(path) >= max_depth:
+            continue
+        for callee, edge_ct in callees.get(func, {}).items():
+            callee_share = edge_ct * scale
+            if callee in on_path or callee_share < min_share:
+                continue
+            stack.append((callee, callee_share, path, on_path | {callee}))
+    return [f"{k} {int(v * 1_000_000)}" for k, v in folded.items() if v * 1_000_000 >= 1]
+
+
+class Profile:
+    """One profiled unit of work (a Streamlit rerun or a backend call)."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.sections: Dict[str, Dict[str, float]] = {}
+        self._profiler = cProfile.Profile()
+        self._started_tracemalloc = False
+        self._cprofile_active = False
+        self._start = 0.0
+        self.summary: Dict[str, Any] | None = None
+
+    def start(self) -> "Profile":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        try:
+            self._profiler.enable()
+            self._cprofile_active = True
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process; keep timing and memory only
+            pass
+        return self
+
+    def add_section(self, name: str, seconds: float) -> None:
+        entry = self.sections.setdefault(name, {"ms": 0.0, "calls": 0})
+        entry["ms"] += seconds * 1000
+        entry["calls"] += 1
+
+    def stop(self) -> Dict[str, Any]:
+        if self._cprofile_active:
+            self._profiler.disable()
+        wall = time.perf_counter() - self._start
+        # Another concurrent profile may have stopped tracemalloc already
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        allocations = tracemalloc.take_snapshot().statistics("lineno")[:10] if tracing else []
+        if self._started_tracemalloc and tracing:
+            tracemalloc.stop()
+
+        stats = pstats.Stats(self._profiler) if self._cprofile_active else None
+        raw = stats.stats if stats is not None else {}  # type: ignore[attr-defined]
+        top = sorted(raw.items(), key=lambda kv: kv[1][3], reverse=True)[:15]
+        self.summary = {
+            "label": self.label,
+            "wall_ms": round(wall * 1000, 1),
+            "sections": {k: {"ms": round(v["ms"], 1), "calls": int(v["calls"])} for k, v in self.sections.items()},
+            "memory_peak_kb": round(peak / 1024, 1),
+            "memory_current_kb": round(current / 1024, 1),
+            "top_functions": [
+                {"function": _func_label(func), "calls": nc, "cumulative_ms": round(ct * 1000, 1)}
+                for func, (_cc, nc, _tt, ct, _callers) in top
+            ],
+            "top_allocations": [
+                {"where": str(stat.traceback[0]), "kb": round(stat.size / 1024, 1)}
+                for stat in allocations
+            ],
+        }
+        self.summary["files"] = self._write(stats)
+        return self.summary
+
+    def _write(self, stats: pstats.Stats | None) -> Dict[str, str]:
+        global _counter
+        with _counter_lock:
+            _counter += 1
+            n = _counter
+        out_dir = Path(config.PROFILE_DIR)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.label)
+        base = out_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{n:04d}-{safe_label}"
+        files = {"json": str(base.with_suffix(".json"))}
+        if stats is not None:
+            files["prof"] = str(base.with_suffix(".prof"))
+            files["collapsed"] = str(base.with_suffix(".collapsed"))
+            stats.dump_stats(files["prof"])
+            Path(files["collapsed"]).write_text("\n".join(collapsed_stacks(stats)) + "\n", encoding="utf-8")
+        Path(files["json"]).write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+        _rotate(list(files.values()))
+        return files
+
+
+def _rotate(paths: list[str]) -> None:
+    """Record a run's files and delete the oldest runs beyond PROFILE_KEEP."""
+    with _counter_lock:
+        _written.append(paths)
+        expired = []
+        while len(_written) > config.PROFILE_KEEP:
+            expired.extend(_written.popleft())
+    for path in expired:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def start_rerun(label: str = "rerun") -> Profile:
+    """Begin profiling the current thread's rerun (replacing any unfinished one)."""
+    stale = getattr(_local, "active", None)
+    if stale is not None:
+        # A previous rerun was interrupted before finish_rerun; drop it
+        if stale._cprofile_active:
+            stale._profiler.disable()
+        if stale._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    _local.active = Profile(label).start()
+    return _local.active
+
+
+def finish_rerun() -> Dict[str, Any] | None:
+    """Stop the current thread's rerun profile, write its files and return the summary."""
+    active = getattr(_local, "active", None)
+    if active is None:
+        return None
+    _local.active = None
+    return active.stop()
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Time a named block inside the active rerun (no-op when not profiling)."""
+    active = getattr(_local, "active", None)
+    if active is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        active.add_section(name, time.perf_counter() - start)
+
+
+@contextmanager
+def call(name: str) -> Iterator[None]:
+    """Wrap a backend call: a section of the active rerun, or its own profile if enabled."""
+    if getattr(_local, "active", None) is not None:
+        with section(name):
+            yield
+        return
+    if not enabled():
+        yield
+        return
+    profile = Profile(name).start()
+    try:
+        yield
+    finally:
+        profile.stop()
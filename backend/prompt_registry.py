@@ -0,0 +1,128 @@
+"""
+Process-wide registry for prompts.json and systemprompts.json.
+
+Files are parsed and validated once and shared by every session
+(backend and Streamlit frontend). Each access only stats the file; it is re-read
+when its mtime changes, so prompt edits are picked up without a restart.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+PROMPTS_PATH = Path(__file__).resolve().parent / "prompts.json"
+SYSTEM_PROMPTS_PATH = Path(__file__).resolve().parent / "systemprompts.json"
+
+
+def _join_prompt(value: Any) -> str:
+    """Prompts may be stored as a string or a list of lines."""
+    if isinstance(value, list):
+        return "\n".join(str(line) for line in value).strip()
+    return str(value or "").strip()
+
+
+def _prepare_prompts(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ValueError("prompts.json must contain a JSON object")
+    templates = data.get("prompts", {})
+    if not isinstance(templates, dict):
+        raise ValueError("prompts.json: 'prompts' must be an object")
+    for key, template in templates.items():
+        if not isinstance(template, dict):
+            raise ValueError(f"prompts.json: template {key!r} must be an object")
+        if not isinstance(template.get("system_prompt", ""), str):
+            raise ValueError(f"prompts.json: {key}.system_prompt must be a string")
+    return {"raw": data, "templates": templates}
+
+
+def _prepare_system_prompts(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ValueError("systemprompts.json must contain a JSON object")
+    # Expect either {"system_prompt": "..." | [...]} or {"global": "..."}
+    global_sp = _join_prompt(data.get("system_prompt") or data.get("global"))
+    return {"raw": data, "global": global_sp}
+
+
+class _CachedFile:
+    """A JSON file parsed once and reloaded only when its mtime changes."""
+
+    def __init__(self, path: Path, prepare: Callable[[Any], Dict[str, Any]]):
+        self.path = path
+        self._prepare = prepare
+        self._lock = threading.Lock()
+        self._mtime: int | None = None
+        self._value: Dict[str, Any] | None = None
+        self.last_error: str | None = None
+        self.loads = 0
+
+    def get(self) -> Dict[str, Any] | None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._value is not None and mtime == self._mtime:
+            return self._value
+        with self._lock:
+            if self._value is not None and mtime == self._mtime:
+                return self._value
+            if mtime is None:
+                # A missing file is not an error; callers fall back to defaults
+                self._value = None
+                self.last_error = None
+            else:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._value = self._prepare(json.load(f))
+                    self.last_error = None
+                    self.loads += 1
+                except Exception as e:
+                    # Keep serving the last good version if an edit is broken
+                    self.last_error = f"{self.path.name}: {e}"
+            self._mtime = mtime
+            return self._value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mtime = None
+            self._value = None
+            self.last_error = None
+
+
+_PROMPTS = _CachedFile(PROMPTS_PATH, _prepare_prompts)
+_SYSTEM_PROMPTS = _CachedFile(SYSTEM_PROMPTS_PATH, _prepare_system_prompts)
+
+
+def get_prompts() -> Dict[str, Any]:
+    """Full prompts.json document."""
+    value = _PROMPTS.get()
+    return value["raw"] if value else {}
+
+
+def get_templates() -> Dict[str, Any]:
+    """The "prompts" section of prompts.json, keyed by template name."""
+    value = _PROMPTS.get()
+    return value["templates"] if value else {}
+
+
+def get_system_prompts() -> Dict[str, Any]:
+    """Full systemprompts.json document."""
+    value = _SYSTEM_PROMPTS.get()
+    return value["raw"] if value else {}
+
+
+def global_system_prompt() -> str:
+    """Global system prompt from systemprompts.json ("" if missing or invalid)."""
+    value = _SYSTEM_PROMPTS.get()
+    return value["global"] if value else ""
+
+
+def last_errors() -> list[str]:
+    """Load/validation errors from the most recent access, if any."""
+    return [e for e in (_PROMPTS.last_error, _SYSTEM_PROMPTS.last_error) if e]
+
+
+def clear_cache() -> None:
+    _PROMPTS.clear()
+    _SYSTEM_PROMPTS.clear()
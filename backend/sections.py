@@ -0,0 +1,183 @@
+"""
+Structured, section-keyed documents (opt-in with STRUCTURED_OUTPUT=1).
+
+Instead of free-form markdown, the model returns a JSON object keyed by the
+canonical section names of the mode ("Skills & Technologies", "Key Features",
+...). The reply is validated here and rendered to markdown locally, so no
+heading has to be matched fuzzily afterwards.
+
+Every section depends on a few profile fields. A section body is cached under
+(session, section, hash of those fields), so a later turn only asks the model
+for sections whose inputs changed (or that the user's input targets).
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+# Section key (as matched by chat_core._match_section) -> canonical heading
+SECTION_TITLES = {
+    "about": "About Me",
+    "skills": "Skills & Technologies",
+    "experience": "Experience",
+    "education": "Education",
+    "contact": "Contact Information",
+    "overview": "Overview",
+    "technologies": "Technologies Used",
+    "features": "Key Features",
+    "challenges": "Challenges & Solutions",
+    "results": "Results & Impact",
+    "objectives": "Learning Objectives",
+    "application": "Practical Applications",
+    "future": "Future Learning Goals",
+}
+
+# Sections of each mode, in document order, with the profile fields each one is written from
+SECTION_FIELDS = {
+    "Personal Bio": {
+        "about": ("name", "title", "experience"),
+        "skills": ("skills", "technologies"),
+        "experience": ("title", "experience", "projects", "achievements"),
+        "education": ("education", "certifications"),
+        "contact": ("name", "contact"),
+    },
+    "Project Summaries": {
+        "overview": ("title", "projects"),
+        "technologies": ("technologies", "skills"),
+        "features": ("projects",),
+        "challenges": ("projects", "achievements"),
+        "results": ("projects", "achievements"),
+    },
+    "Learning Reflections": {
+        "objectives": ("title", "education", "certifications"),
+        "skills": ("skills", "technologies", "certifications"),
+        "application": ("projects", "experience"),
+        "challenges": ("projects", "achievements"),
+        "future": ("skills", "education", "certifications"),
+    },
+}
+
+MAX_SECTIONS = 2048
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def sections_for(content_type: str) -> Dict[str, tuple]:
+    """Canonical title -> profile fields, in document order (Personal Bio for unknown modes)."""
+    fields = SECTION_FIELDS.get(content_type, SECTION_FIELDS["Personal Bio"])
+    return {SECTION_TITLES[key]: deps for key, deps in fields.items()}
+
+
+def section_hash(extracted_info: Dict[str, Any] | None, fields: tuple) -> str:
+    extracted_info = extracted_info or {}
+    # Empty values hash like missing ones, so extraction noise does not invalidate a section
+    inputs = {field: extracted_info.get(field) or None for field in fields}
+    data = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _text(value: Any) -> str:
+    """Markdown for a JSON value: strings as is, lists and objects as bullets, other scalars as text."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return "\n".join(f"- {text}" for text in map(_text, value) if text)
+    if isinstance(value, dict):
+        return "\n".join(f"- **{key}**: {text}" for key, text in ((k, _text(v)) for k, v in value.items()) if text)
+    if value is None or isinstance(value, bool):
+        return ""
+    return str(value)
+
+
+def _body(title: str, value: Any) -> str:
+    body = _text(value)
+    # Drop a heading the model repeated despite the instructions
+    first, _, rest = body.partition("\n")
+    if first.startswith("#") and first.lstrip("#").strip().lower() == title.lower():
+        body = rest.strip()
+    return body
+
+
+def parse_sections(text: str, content_type: str) -> Dict[str, str]:
+    """Canonical title -> markdown body from a model reply; ValueError if it is not a JSON object.
+
+    Keys are matched case-insensitively; keys that are not sections of the mode are dropped.
+    Each section is validated on its own: non-text values are converted to markdown.
+    """
+    data = json.loads(_FENCE_RE.sub("", text or ""))
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object keyed by section name")
+    titles = {title.lower(): title for title in sections_for(content_type)}
+    parsed: Dict[str, str] = {}
+    for key, value in data.items():
+        title = titles.get(str(key).strip().lower())
+        if title is not None:
+            parsed[title] = _body(title, value)
+    return parsed
+
+
+def render(content_type: str, extracted_info: Dict[str, Any] | None, bodies: Dict[str, str]) -> str:
+    """Markdown document: header from the profile, then the non-empty sections in order."""
+    extracted_info = extracted_info or {}
+    lines = [f"# {extracted_info.get('name') or content_type}"]
+    if extracted_info.get("title"):
+        lines.append(f"\n**{extracted_info['title']}**")
+    for title in sections_for(content_type):
+        body = bodies.get(title, "").strip()
+        if body:
+            lines.append(f"\n## {title}\n\n{body}")
+    return "\n".join(lines) + "\n"
+
+
+_LOCK = threading.Lock()
+# (session_id, title, section hash) -> body
+_SECTIONS: "OrderedDict[tuple[str, str, str], str]" = OrderedDict()
+_COUNTS = {"generated": 0, "reused": 0}
+
+
+def cached(session_id: str, hashes: Dict[str, str]) -> Dict[str, str]:
+    """Bodies already generated for these section inputs (title -> body)."""
+    found: Dict[str, str] = {}
+    with _LOCK:
+        for title, digest in hashes.items():
+            key = (session_id, title, digest)
+            if key in _SECTIONS:
+                _SECTIONS.move_to_end(key)
+                found[title] = _SECTIONS[key]
+    return found
+
+
+def store(session_id: str, hashes: Dict[str, str], bodies: Dict[str, str], reused: int = 0) -> None:
+    with _LOCK:
+        for title, body in bodies.items():
+            _SECTIONS[(session_id, title, hashes[title])] = body
+            _SECTIONS.move_to_end((session_id, title, hashes[title]))
+        while len(_SECTIONS) > MAX_SECTIONS:
+            _SECTIONS.popitem(last=False)
+        _COUNTS["generated"] += len(bodies)
+        _COUNTS["reused"] += reused
+
+
+def forget_session(session_id: str) -> None:
+    with _LOCK:
+        for key in [k for k in _SECTIONS if k[0] == session_id]:
+            del _SECTIONS[key]
+
+
+def section_report() -> Dict[str, Any]:
+    """Sections generated by the model vs reused from the cache."""
+    with _LOCK:
+        report: Dict[str, Any] = dict(_COUNTS)
+    total = report["generated"] + report["reused"]
+    report["reuse_ratio"] = round(report["reused"] / total, 3) if total else 0.0
+    return report
+
+
+def clear() -> None:
+    with _LOCK:
+        _SECTIONS.clear()
+        for key in _COUNTS:
+            _COUNTS[key] = 0
@@ -1,14 +1,259 @@
-SESSIONS: dict[str, list[dict]] = {}
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
 
+try:
+    from . import config  # type: ignore
+    from .messages import Message, MessageLog  # type: ignore
+except ImportError:  # when executed without package context
+    import config  # type: ignore
+    from messages import Message, MessageLog  # type: ignore
 
-def get_history(session_id: str) -> list[dict]:
-    return list(SESSIONS.get(session_id, []))
+SESSIONS: dict[str, MessageLog] = {}
+
+
+class InMemoryStore:
+    """Process-local sessions (default; one app process or sticky routing)."""
+
+    def get_history(self, session_id: str, limit: int | None = None) -> list[Message]:
+        # Messages are read-only records; older bodies are decompressed on access
+        history = SESSIONS.get(session_id)
+        if not history:
+            return []
+        return history[-limit:] if limit else list(history)
+
+    def append_message(self, session_id: str, role: str, content: str) -> None:
+        history = SESSIONS.get(session_id)
+        if history is None:
+            history = SESSIONS[session_id] = MessageLog()
+        history.append(role, content)
+
+    def reset_session(self, session_id: str) -> None:
+        SESSIONS.pop(session_id, None)
+
+
+class SQLiteStore:
+    """Sessions in a SQLite file, shared by all worker processes on one host."""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " session_id TEXT NOT NULL,"
+                " role TEXT NOT NULL,"
+                " content TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # WAL lets readers in other workers proceed while one worker appends
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_history(self, session_id: str, limit: int | None = None) -> list[dict]:
+        if limit:
+            rows = self._connect().execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()[::-1]
+        else:
+            rows = self._connect().execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def append_message(self, session_id: str, role: str, content: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+                (session_id, role, content),
+            )
+
+    def reset_session(self, session_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+
+class LocalRedis:
+    """In-process stand-in for the Redis commands RedisStore uses (lists, TTL, pipelines)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._lists: dict[str, list[str]] = {}
+        self._expires: dict[str, float] = {}
+
+    def _live(self, key: str) -> list[str] | None:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._lists.pop(key, None)
+            self._expires.pop(key, None)
+        return self._lists.get(key)
+
+    @staticmethod
+    def _span(length: int, start: int, end: int) -> tuple[int, int]:
+        # Redis ranges are inclusive and accept negative indexes
+        start = max(start + length if start < 0 else start, 0)
+        end = end + length if end < 0 else min(end, length - 1)
+        return start, end + 1
+
+    def rpush(self, key: str, *values: str) -> int:
+        with self._lock:
+            items = self._live(key)
+            if items is None:
+                items = self._lists[key] = []
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, key: str, start: int, end: int) -> list[str]:
+        with self._lock:
+            items = self._live(key) or []
+            lo, hi = self._span(len(items), start, end)
+            return items[lo:hi]
+
+    def ltrim(self, key: str, start: int, end: int) -> bool:
+        with self._lock:
+            items = self._live(key)
+            if items is not None:
+                lo, hi = self._span(len(items), start, end)
+                items[:] = items[lo:hi]
+            return True
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            if self._live(key) is None:
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._live(key) is not None
+                self._lists.pop(key, None)
+                self._expires.pop(key, None)
+            return removed
+
+    def pipeline(self, transaction: bool = True) -> "_LocalPipeline":
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    """Queues commands and runs them together, like a redis-py pipeline."""
+
+    def __init__(self, client: LocalRedis):
+        self._client = client
+        self._commands: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        if name not in ("rpush", "lrange", "ltrim", "expire", "delete"):
+            raise AttributeError(name)
+
+        def queue(*args: Any) -> "_LocalPipeline":
+            self._commands.append((name, args))
+            return self
+        return queue
+
+    def execute(self) -> list[Any]:
+        with self._client._lock:
+            results = [getattr(self._client, name)(*args) for name, args in self._commands]
+        self._commands = []
+        return results
+
+    def __enter__(self) -> "_LocalPipeline":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._commands = []
+
+
+class RedisStore:
+    """Sessions as Redis lists shared by every app replica; idle sessions expire after `ttl` seconds."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: int = 604800,
+                 max_messages: int = 1000, client: Any = None, prefix: str = "devfolio:session:"):
+        self.url = url
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self.prefix = prefix
+        self._client = client
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url, decode_responses=True)
+        return self._client
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get_history(self, session_id: str, limit: int | None = None) -> list[dict]:
+        key = self._key(session_id)
+        # One round trip: read the tail and keep the session alive
+        pipe = self._get_client().pipeline(transaction=False)
+        pipe.lrange(key, -limit if limit else 0, -1)
+        pipe.expire(key, self.ttl)
+        raw, _ = pipe.execute()
+        return [json.loads(item) for item in raw]
+
+    def append_message(self, session_id: str, role: str, content: str) -> None:
+        key = self._key(session_id)
+        record = json.dumps({"role": role, "content": content}, ensure_ascii=False, separators=(",", ":"))
+        pipe = self._get_client().pipeline(transaction=True)
+        pipe.rpush(key, record)
+        if self.max_messages:
+            pipe.ltrim(key, -self.max_messages, -1)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def reset_session(self, session_id: str) -> None:
+        self._get_client().delete(self._key(session_id))
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store():
+    """Session store selected by SESSION_STORE (memory | sqlite | redis), created once per process."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                if config.SESSION_STORE == "sqlite":
+                    _STORE = SQLiteStore(config.SESSION_DB_PATH)
+                elif config.SESSION_STORE == "redis":
+                    _STORE = RedisStore(config.REDIS_URL, ttl=config.SESSION_TTL)
+                else:
+                    _STORE = InMemoryStore()
+    return _STORE
+
+
+def set_store(store) -> None:
+    """Install a specific store (None re-reads SESSION_STORE on next use)."""
+    global _STORE
+    _STORE = store
+
+
+def get_history(session_id: str, limit: int | None = None) -> list[dict]:
+    """Session messages in order; with `limit`, only the newest `limit` of them."""
+    return get_store().get_history(session_id, limit)
 
 
 def append_message(session_id: str, role: str, content: str) -> None:
-    history = SESSIONS.setdefault(session_id, [])
-    history.append({"role": role, "content": content})
+    get_store().append_message(session_id, role, content)
 
 
 def reset_session(session_id: str) -> None:
-    SESSIONS.pop(session_id, None)
+    get_store().reset_session(session_id)
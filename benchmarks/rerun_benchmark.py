@@ -0,0 +1,223 @@
+"""
+Rerun latency and memory benchmark for the Streamlit app.
+
+Drives frontend/streamlit_chat_canvas.py headlessly with Streamlit's AppTest,
+replaying a multi-turn conversation (chat inputs, mode switches, Clear All)
+while chat_core's generation functions are replaced by a deterministic stub, so
+only the script body is measured. Wall time and traced memory are recorded for
+every rerun as the chat history grows to MAX_MESSAGES_HISTORY and beyond.
+
+    python benchmarks/rerun_benchmark.py
+    python benchmarks/rerun_benchmark.py --turns 60 --json reruns.json
+    python benchmarks/rerun_benchmark.py --conversation my_session.json --no-tracemalloc
+
+A conversation file is a JSON list of steps: {"chat": "text"},
+{"mode": "Project Summaries"} or {"clear": true}.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = ROOT / "frontend" / "streamlit_chat_canvas.py"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+MODES = ["Personal Bio", "Project Summaries", "Learning Reflections"]
+
+# Representative user turns, cycled to build long conversations
+SAMPLE_TURNS = [
+    "Hi, I'm Jane Doe, a senior backend engineer based in Berlin, Germany.",
+    "I have 7 years of experience with Python, Django, FastAPI and PostgreSQL.",
+    "At Acme Corp I led the migration of a monolith to microservices on Kubernetes.",
+    "I hold a BSc in Computer Science from TU Munich.",
+    "Add Docker and Terraform to my skills.",
+    "One project: a real-time analytics pipeline with Kafka and ClickHouse, cutting report latency by 80%.",
+    "I'm AWS Certified Solutions Architect and mentor two junior developers.",
+    "Make the summary more concise and mention my interest in developer tooling.",
+    "I recently learned Rust to speed up a log-parsing service; it was 5x faster.",
+    "My GitHub is github.com/janedoe and I'm open to staff engineer roles.",
+]
+
+
+def _max_messages_history() -> int:
+    match = re.search(r"^MAX_MESSAGES_HISTORY\s*=\s*(\d+)", APP.read_text(encoding="utf-8"), re.M)
+    return int(match.group(1)) if match else 200
+
+
+def default_conversation(turns: int, switch_every: int = 15) -> list[dict]:
+    """Chat turns with a mode switch every `switch_every` turns, then Clear All and a short restart."""
+    steps: list[dict] = []
+    for i in range(turns):
+        steps.append({"chat": SAMPLE_TURNS[i % len(SAMPLE_TURNS)]})
+        if switch_every and (i + 1) % switch_every == 0:
+            steps.append({"mode": MODES[((i + 1) // switch_every) % len(MODES)]})
+    steps.append({"clear": True})
+    steps.extend({"chat": text} for text in SAMPLE_TURNS[:3])
+    return steps
+
+
+def install_stub(delay_ms: float = 0.0) -> None:
+    """Replace chat_core's generation entry points with deterministic, local ones."""
+    from backend import chat_core
+
+    counter = {"n": 0}
+
+    def _document(content_type, extracted_info=None, extra_input=None):
+        counter["n"] += 1
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        info = extracted_info or {}
+        lines = [f"# {info.get('name') or 'Your Name'}", "", f"## {content_type}", ""]
+        for key in sorted(info):
+            if info[key]:
+                lines.append(f"- **{key}**: {json.dumps(info[key], sort_keys=True)}")
+        lines += ["", "## Latest Update", "", extra_input or "(regenerated)", "", f"_revision {counter['n']}_"]
+        return "\n".join(lines)
+
+    def generate_generic_content(session_id, content_type, extracted_info=None, extra_input=None, history_limit=20):
+        return _document(content_type, extracted_info, extra_input)
+
+    def stream_generic_content(session_id, content_type, extracted_info=None, extra_input=None, history_limit=20):
+        text = _document(content_type, extracted_info, extra_input)
+        # A handful of chunks, as a streamed response would arrive
+        step = max(1, len(text) // 8)
+        for i in range(0, len(text), step):
+            yield text[i:i + step]
+
+    def chat_with_history(session_id, user_input, *args, **kwargs):
+        return f"Noted: {user_input[:60]}"
+
+    chat_core.generate_generic_content = generate_generic_content
+    chat_core.stream_generic_content = stream_generic_content
+    chat_core.chat_with_history = chat_with_history
+
+
+def _apply(at, step: dict):
+    if "chat" in step:
+        return at.chat_input[0].set_value(step["chat"])
+    if "mode" in step:
+        return at.radio(key="mode_selector").set_value(step["mode"])
+    if step.get("clear"):
+        return next(b for b in at.button if "Clear All" in b.label).click()
+    raise ValueError(f"Unknown step: {step}")
+
+
+def replay(steps: list[dict], progressive: bool, trace_memory: bool, timeout: float) -> list[dict]:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    if trace_memory:
+        tracemalloc.start()
+    samples = []
+    try:
+        for i, step in enumerate([{"initial": True}] + steps):
+            if trace_memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            if i == 0:
+                at.run()
+                if not progressive:
+                    at.toggle(key="progressive_preview").set_value(False).run()
+            else:
+                _apply(at, step).run()
+            wall = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"Step {i} {step} raised: {at.exception[0].value}")
+            current, peak = tracemalloc.get_traced_memory() if trace_memory else (0, 0)
+            samples.append({
+                "step": i,
+                "action": next(iter(step)),
+                "messages": len(at.session_state.messages),
+                "versions": len(at.session_state.versions),
+                "wall_ms": round(wall * 1000, 2),
+                "memory_current_kb": round(current / 1024, 1),
+                "memory_peak_kb": round(peak / 1024, 1),
+            })
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return samples
+
+
+def summarize(samples: list[dict], bucket: int) -> dict:
+    """Wall-time percentiles per action and per history-size bucket."""
+    def stats(rows: list[dict]) -> dict:
+        walls = sorted(r["wall_ms"] for r in rows)
+        return {
+            "reruns": len(walls),
+            "p50_ms": round(statistics.median(walls), 2),
+            "p95_ms": walls[min(len(walls) - 1, int(len(walls) * 0.95))],
+            "max_peak_kb": max(r["memory_peak_kb"] for r in rows),
+        }
+
+    by_action: dict = {}
+    by_history: dict = {}
+    for row in samples[1:]:
+        by_action.setdefault(row["action"], []).append(row)
+        if row["action"] == "chat":
+            low = (row["messages"] - 1) // bucket * bucket
+            by_history.setdefault(f"{low}-{low + bucket}", []).append(row)
+    return {
+        "initial_run_ms": samples[0]["wall_ms"],
+        "final_memory_kb": samples[-1]["memory_current_kb"],
+        "by_action": {k: stats(v) for k, v in by_action.items()},
+        "chat_by_history": {k: stats(v) for k, v in by_history.items()},
+    }
+
+
+def print_report(summary: dict) -> None:
+    traced = summary["final_memory_kb"] > 0
+    memory = f" | traced memory at end {summary['final_memory_kb']} KB" if traced else ""
+    print(f"initial run {summary['initial_run_ms']} ms{memory}")
+
+    def line(label: str, s: dict) -> str:
+        peak = f"  peak {s['max_peak_kb']:>9.1f} KB" if traced else ""
+        return f"  {label:<9} {s['reruns']:>4} reruns  p50 {s['p50_ms']:>8.1f} ms  p95 {s['p95_ms']:>8.1f} ms{peak}"
+
+    print("\nby action:")
+    for action, s in summary["by_action"].items():
+        print(line(action, s))
+    print("\nchat reruns by history size (messages):")
+    for bucket, s in summary["chat_by_history"].items():
+        print(line(bucket, s))
+
+
+def main(argv: list[str] | None = None) -> int:
+    max_history = _max_messages_history()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=max_history // 2 + 10,
+                        help="chat turns in the default conversation (each adds 2 messages)")
+    parser.add_argument("--conversation", help="JSON file with the steps to replay instead")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="simulated model latency per generation")
+    parser.add_argument("--no-progressive", action="store_true", help="turn off the instant draft preview")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip memory tracing (cleaner timings)")
+    parser.add_argument("--bucket", type=int, default=50, help="history-size bucket width for the report")
+    parser.add_argument("--timeout", type=float, default=60.0, help="AppTest timeout per rerun (seconds)")
+    parser.add_argument("--json", dest="json_path", help="also write per-rerun samples and summary here")
+    args = parser.parse_args(argv)
+
+    if args.conversation:
+        steps = json.loads(Path(args.conversation).read_text(encoding="utf-8"))
+    else:
+        steps = default_conversation(args.turns)
+
+    install_stub(args.delay_ms)
+    samples = replay(steps, not args.no_progressive, not args.no_tracemalloc, args.timeout)
+    summary = summarize(samples, args.bucket)
+    print(f"{len(samples)} reruns, history capped at {max_history} messages")
+    print_report(summary)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({"summary": summary, "samples": samples}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Cold-start benchmark for the Streamlit app and the terminal entry point.
+
+Each target is started in a fresh interpreter with ``-X importtime``; we report the
+median wall time and a summary of the slowest top-level imports.
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10 --top 15 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TARGETS = {
+    # Backend core as imported by the UI
+    "chat_core": "import backend.chat_core",
+    # Terminal entry point (backend/llm_service.py), without entering the chat loop
+    "llm_service": "import sys; sys.path.insert(0, 'backend'); import llm_service",
+    # Full Streamlit script in bare mode (no server), i.e. the first rerun's import cost
+    "streamlit_app": (
+        "import runpy; runpy.run_path('frontend/streamlit_chat_canvas.py', run_name='__main__')"
+    ),
+    # Provider SDK that chat_core defers until the first model call
+    "provider_sdk": "import langchain_google_genai",
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse `-X importtime` output into rows of module/self_us/cumulative_us/depth."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        rows.append({
+            "module": m.group(4),
+            "self_us": int(m.group(1)),
+            "cumulative_us": int(m.group(2)),
+            # Two leading spaces per nesting level after the separator
+            "depth": (len(m.group(3)) - 1) // 2,
+        })
+    return rows
+
+
+def run_target(code: str) -> tuple[float, list[dict]]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Target failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    return wall, parse_importtime(proc.stderr)
+
+
+def benchmark(name: str, code: str, runs: int, top: int) -> dict:
+    walls = []
+    last_rows: list[dict] = []
+    for _ in range(runs):
+        wall, last_rows = run_target(code)
+        walls.append(wall)
+    top_level = [r for r in last_rows if r["depth"] == 0]
+    slowest = sorted(top_level, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "target": name,
+        "runs": runs,
+        "wall_ms_median": round(statistics.median(walls) * 1000, 1),
+        "wall_ms_min": round(min(walls) * 1000, 1),
+        "import_ms_total": round(sum(r["cumulative_us"] for r in top_level) / 1000, 1),
+        "modules_imported": len(last_rows),
+        "slowest_imports": [
+            {"module": r["module"], "cumulative_ms": round(r["cumulative_us"] / 1000, 1)}
+            for r in slowest
+        ],
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"\n== {result['target']} ==")
+    print(
+        f"wall median {result['wall_ms_median']} ms (min {result['wall_ms_min']} ms, "
+        f"{result['runs']} runs) | imports {result['import_ms_total']} ms "
+        f"across {result['modules_imported']} modules"
+    )
+    for row in result["slowest_imports"]:
+        print(f"  {row['cumulative_ms']:>9.1f} ms  {row['module']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS), help="limit to target(s)")
+    parser.add_argument("--json", dest="json_path", help="also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.target or list(TARGETS):
+        result = benchmark(name, TARGETS[name], args.runs, args.top)
+        print_report(result)
+        results.append(result)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
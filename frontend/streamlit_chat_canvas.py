@@ -1,17 +1,12 @@
 import streamlit as st
-from datetime import datetime
-import json
 import sys
 import os
 import pathlib
-import re
-from collections import OrderedDict
 
 # Constants for maintainability
-MAX_ANALYSIS_MESSAGES = 20
 PREVIEW_HEIGHT = 500
-LOCATION_CONTEXT_WINDOW = 50
 MAX_MESSAGES_HISTORY = 200
+CHAT_PAGE_SIZE = 20
 
 # Load Streamlit secrets into environment variables for LangChain compatibility
 # This ensures GOOGLE_API_KEY is available when deployed to Streamlit Cloud
@@ -30,7 +25,40 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from frontend.components import file_upload
-from backend import chat_core
+from backend import chat_core, fingerprint, long_input, model_router, prompt_registry, profiling, sections
+from backend import session_memory as memory
+from backend.profile_extraction import (
+    MAX_ANALYSIS_MESSAGES,
+    create_comprehensive_fallback,
+    extract_user_info_from_chat,
+    merge_extracted_info,
+)
+from backend.content_versions import VersionStore, section_diff
+from backend.messages import MessageLog
+
+# Opt-in profiling of each rerun (DEVFOLIO_PROFILE=1 or ?profile=1): cProfile + tracemalloc,
+# stats files in PROFILE_DIR and a timing breakdown in the sidebar
+PROFILING = profiling.enabled() or st.query_params.get("profile") == "1"
+if PROFILING:
+    profiling.start_rerun("rerun")
+
+def finish_profile(triggered_rerun=False):
+    """Close this rerun's profile and keep a compact summary for the sidebar"""
+    if not PROFILING:
+        return
+    summary = profiling.finish_rerun()
+    if summary:
+        runs = st.session_state.setdefault("profile_runs", [])
+        runs.append({k: summary[k] for k in ("wall_ms", "memory_peak_kb", "sections", "files")})
+        # Reruns that handled an action (chat message, mode switch, ...) end in rerun();
+        # the run after them only redraws
+        runs[-1]["triggered_rerun"] = triggered_rerun
+        del runs[:-5]
+
+def rerun():
+    """st.rerun() that records the current rerun's profile first"""
+    finish_profile(triggered_rerun=True)
+    st.rerun()
 
 # Page configuration
 st.set_page_config(
@@ -48,7 +76,8 @@ with col_logo[1]:
 st.markdown("---")
 
 # Custom CSS (keep minimal and stable selectors)
-st.markdown("""
+with profiling.section("css"):
+    st.markdown("""
 <style>
 /* Light touch styling to avoid brittle selectors */
 :root {
@@ -68,182 +97,14 @@ textarea {
 </style>
 """, unsafe_allow_html=True)
 
-# Load prompts from JSON files
+# Load prompts from the shared registry (parsed once per process, reloaded when the files change)
 def load_prompts():
     """Load prompts from JSON files with graceful fallback"""
-    try:
-        prompts_path = ROOT / "backend" / "prompts.json"
-        system_prompts_path = ROOT / "backend" / "systemprompts.json"
-
-        prompts = {}
-        system_prompts = {}
-
-        if prompts_path.exists():
-            with open(prompts_path, 'r') as f:
-                prompts = json.load(f)
-        if system_prompts_path.exists():
-            with open(system_prompts_path, 'r') as f:
-                system_prompts = json.load(f)
-
-        return prompts, system_prompts
-    except Exception as e:
-        st.error(f"Error loading prompts: {e}")
-        return {}, {}
-
-def extract_user_info_from_chat(messages):
-    """Extract key information from chat history with safer, heuristic parsing"""
-    extracted_info = {
-        "name": "",
-        "title": "",
-        "contact": {},
-        "technologies": [],
-        "experience": {},
-        "education": [],
-        "projects": [],
-        "skills": {},
-        "achievements": [],
-        "certifications": []
-    }
-
-    # Analyze recent messages for information
-    recent_messages = messages[-MAX_ANALYSIS_MESSAGES:]
-
-    full_text = " ".join([msg.get("content", "") for msg in recent_messages if msg.get("role") == "user"]) or ""
-    full_text_lower = full_text.lower()
-
-    # Extract name (prefer anchored phrases)
-    name = ""
-    anchored_patterns = [
-        r"\bmy name is\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
-        r"\bi am\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
-        r"\bi'm\s+([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b",
-    ]
-    for pat in anchored_patterns:
-        m = re.search(pat, full_text)
-        if m:
-            candidate = m.group(1).strip()
-            name = candidate
-            break
-    if not name:
-        # Fallback: capture first capitalized pair not containing common role words
-        m = re.search(r"\b([A-Z][a-zA-Z\-']+\s+[A-Z][a-zA-Z\-']+)\b", full_text)
-        if m:
-            candidate = m.group(1)
-            if not re.search(r"\b(Engineer|Developer|Manager|Senior|Lead|Principal)\b", candidate):
-                name = candidate
-    if name:
-        extracted_info["name"] = name
-
-    # Extract title/role with prioritization
-    role_keywords = OrderedDict([
-        ("level", ["principal", "staff", "lead", "senior", "jr", "junior"]),
-        ("role", ["full stack", "full-stack", "fullstack", "frontend", "front-end", "front end", "backend", "back-end", "back end", "devops", "sre", "infrastructure", "data scientist", "data engineer", "data analyst"]),
-        ("noun", ["developer", "engineer", "programmer", "coder"])])
-
-    detected = {k: None for k in role_keywords}
-    for k, words in role_keywords.items():
-        for w in words:
-            if re.search(rf"\b{re.escape(w)}\b", full_text_lower):
-                detected[k] = w
-                break
-    title_parts = []
-    if detected["level"]:
-        title_parts.append(detected["level"].title().replace("Jr", "Junior"))
-    if detected["role"]:
-        role = detected["role"].title().replace("Full stack", "Full-Stack")
-        title_parts.append(role)
-    if detected["noun"]:
-        title_parts.append(detected["noun"].title())
-    if title_parts:
-        extracted_info["title"] = " ".join(OrderedDict.fromkeys(title_parts))
-
-    # Extract contact information
-    email_match = re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", full_text)
-    if email_match:
-        extracted_info["contact"]["email"] = email_match.group(0)
-
-    phone_match = re.search(r"\b(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4})\b", full_text)
-    if phone_match:
-        extracted_info["contact"]["phone"] = phone_match.group(0)
-
-    # Extract location
-    for indicator in ["based in", "located in", "from", "living in"]:
-        idx = full_text_lower.find(indicator)
-        if idx != -1:
-            location_text = full_text[idx + len(indicator): idx + len(indicator) + LOCATION_CONTEXT_WINDOW]
-            candidate = location_text.split('.')[0].split(',')[0].strip()
-            if candidate and len(candidate.split()) <= 5:
-                extracted_info["contact"]["location"] = candidate
-                break
-
-    # Extract technologies with categories using word boundaries
-    tech_categories = {
-        "frontend": ["react", "vue", "angular", "typescript", "javascript", "html", "css", "sass", "bootstrap", "tailwind"],
-        "backend": ["node", "python", "java", "spring", "express", "django", "flask", "fastapi", "ruby", "php"],
-        "database": ["mongodb", "postgresql", "mysql", "redis", "sql", "oracle", "dynamodb"],
-        "cloud": ["aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd"],
-        "tools": ["git", "github", "gitlab", "jest", "webpack", "figma", "jira", "confluence"]
-    }
-    tech_flat = []
-    for category, techs in tech_categories.items():
-        extracted_info["skills"][category] = []
-        for tech in techs:
-            # ci/cd special-case word boundary
-            pattern = r"\b" + re.escape(tech) + r"\b" if tech != "ci/cd" else r"\bci/?cd\b"
-            if re.search(pattern, full_text_lower):
-                label = tech.upper() if tech in {"aws", "gcp"} else tech.title()
-                extracted_info["skills"][category].append(label)
-                tech_flat.append(label)
-    # Dedup while preserving order
-    extracted_info["technologies"] = list(OrderedDict.fromkeys(tech_flat))
-
-    # Extract experience years with constrained patterns
-    years_match = re.search(r"\b(\d{1,2})\+?\s*(years?|yrs?)\b", full_text_lower)
-    if years_match:
-        extracted_info["experience"]["years"] = years_match.group(1)
-
-    # Extract company names heuristically
-    companies = []
-    for indicator in ["worked at", "currently at", "at", "employed at", "with"]:
-        for m in re.finditer(rf"\b{indicator}\b\s+([A-Za-z][A-Za-z&\-\s]{1,40})", full_text_lower):
-            cand = m.group(1).strip().split('.')[0].split(',')[0]
-            # Reject if too long or contains digits
-            if 1 < len(cand.split()) <= 4 and not re.search(r"\d", cand):
-                companies.append(cand.title())
-    if companies:
-        extracted_info["experience"]["companies"] = list(OrderedDict.fromkeys(companies))[:5]
-
-    # Extract education (simple sentence-bound, trimmed)
-    education_hits = []
-    for indicator in ["university", "college", "bachelor", "master", "phd", "degree", "graduated"]:
-        for m in re.finditer(rf"\b.{0,60}{indicator}.{{0,60}}", full_text_lower):
-            snippet = full_text[m.start():m.end()]
-            education_hits.append(snippet.strip().split('\n')[0])
-    if education_hits:
-        norm = list(OrderedDict.fromkeys([e.strip().capitalize() for e in education_hits]))
-        extracted_info["education"] = norm[:3]
-
-    # Extract projects/achievements/certs with basic thresholds
-    def split_sentences(text: str):
-        return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
-
-    sentences = split_sentences(full_text)
-
-    for s in sentences:
-        s_low = s.lower()
-        if any(t in s_low for t in ["project", "built", "created", "developed", "implemented"]) and len(s) > 30:
-            extracted_info["projects"].append(s)
-        if any(t in s_low for t in ["achieved", "accomplished", "award", "recognition", "success", "led", "managed"]) and len(s) > 20:
-            extracted_info["achievements"].append(s)
-        if any(t in s_low for t in ["certified", "certification", "aws", "google cloud", "azure"]) and len(s) > 10:
-            extracted_info["certifications"].append(s)
-
-    # Clean up lists and cap sizes
-    for key, cap in [("projects", 5), ("achievements", 5), ("certifications", 5)]:
-        if extracted_info[key]:
-            extracted_info[key] = list(OrderedDict.fromkeys(extracted_info[key]))[:cap]
-
-    return extracted_info
+    prompts = prompt_registry.get_prompts()
+    system_prompts = prompt_registry.get_system_prompts()
+    for error in prompt_registry.last_errors():
+        st.error(f"Error loading prompts: {error}")
+    return prompts, system_prompts
 
 def get_system_prompt(mode, extracted_info):
     """Get dynamic system prompt that adapts to available information"""
@@ -349,112 +210,81 @@ Focus on creating a polished, comprehensive document that showcases the professi
     except Exception as e:
         return create_comprehensive_fallback(mode, extracted_info)
 
-def create_comprehensive_fallback(mode, extracted_info):
-    """Create comprehensive fallback content"""
-    
-    content_parts = []
-    
-    # Header with name and title
-    if extracted_info["name"] and extracted_info["title"]:
-        content_parts.append(f"# {extracted_info['name']} - {extracted_info['title']}")
-    elif extracted_info["name"]:
-        content_parts.append(f"# {extracted_info['name']}")
-    elif extracted_info["title"]:
-        content_parts.append(f"# Professional Profile - {extracted_info['title']}")
-    else:
-        content_parts.append("# Professional Profile")
-    
-    content_parts.append("")
-    
-    # Contact section
-    if extracted_info["contact"]:
-        content_parts.append("## Contact")
-        for key, value in extracted_info["contact"].items():
-            if value:
-                content_parts.append(f"- **{key.title()}**: {value}")
-        content_parts.append("")
-    
-    # Summary section
-    content_parts.append("## Professional Summary")
-    summary = f"Experienced professional"
-    if extracted_info["experience"].get("years"):
-        summary += f" with {extracted_info['experience']['years']} years of experience"
-    if extracted_info["technologies"]:
-        summary += f" specializing in {', '.join(extracted_info['technologies'][:5])}"
-    summary += ". Proven track record of delivering successful projects and solutions."
-    content_parts.append(summary)
-    content_parts.append("")
-    
-    # Technical Skills
-    if extracted_info["skills"]:
-        content_parts.append("## Technical Skills")
-        for category, skills in extracted_info["skills"].items():
-            if skills:
-                content_parts.append(f"- **{category.title()}**: {', '.join(skills)}")
-        content_parts.append("")
-    elif extracted_info["technologies"]:
-        content_parts.append("## Technical Skills")
-        content_parts.append("- " + "\n- ".join(extracted_info["technologies"][:15]))
-        content_parts.append("")
-    
-    # Professional Experience
-    if extracted_info["experience"].get("companies") or extracted_info["experience"].get("years"):
-        content_parts.append("## Professional Experience")
-        if extracted_info["experience"].get("companies"):
-            for company in extracted_info["experience"]["companies"][:3]:
-                content_parts.append(f"### {extracted_info['title'] or 'Professional'} | {company}")
-                content_parts.append("- Contributed to various projects and initiatives")
-                content_parts.append("- Collaborated with team members on development tasks")
-                content_parts.append("- Applied technical skills to solve business problems")
-                content_parts.append("")
-        else:
-            content_parts.append(f"{extracted_info['experience'].get('years', 'Several')} years of professional experience in relevant roles.")
-            content_parts.append("")
-    
-    # Education
-    if extracted_info["education"]:
-        content_parts.append("## Education")
-        for edu in extracted_info["education"][:3]:
-            content_parts.append(f"- {edu}")
-        content_parts.append("")
-    
-    # Projects
-    if extracted_info["projects"]:
-        content_parts.append("## Projects")
-        for i, project in enumerate(extracted_info["projects"][:4], 1):
-            content_parts.append(f"### Project {i}")
-            content_parts.append(f"{project}")
-            content_parts.append("")
-    
-    # Achievements
-    if extracted_info["achievements"]:
-        content_parts.append("## Achievements")
-        for achievement in extracted_info["achievements"][:5]:
-            content_parts.append(f"- {achievement}")
-        content_parts.append("")
-    
-    # Certifications
-    if extracted_info["certifications"]:
-        content_parts.append("## Certifications")
-        for cert in extracted_info["certifications"][:5]:
-            content_parts.append(f"- {cert}")
-        content_parts.append("")
-    
-    return "\n".join(content_parts)
-
 # Load prompts
 # Static prompts are not required for the generic generator but keep loading for compatibility
-PROMPTS, SYSTEM_PROMPTS = load_prompts()
+with profiling.section("load_prompts"):
+    PROMPTS, SYSTEM_PROMPTS = load_prompts()
 
 # Initialize session state
 if 'messages' not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = MessageLog()
+elif not isinstance(st.session_state.messages, MessageLog):
+    # Sessions started before the compact log still hold a list of dicts
+    st.session_state.messages = MessageLog(st.session_state.messages)
 if 'current_content' not in st.session_state:
     st.session_state.current_content = "# Your Professional Profile\n\nStart chatting to generate your comprehensive README-style content."
 if 'mode' not in st.session_state:
     st.session_state.mode = "Personal Bio"
 if 'user_data' not in st.session_state:
     st.session_state.user_data = {"extracted_info": {}}
+if 'chat_window' not in st.session_state:
+    # Number of newest messages rendered in the chat column
+    st.session_state.chat_window = CHAT_PAGE_SIZE
+if 'versions' not in st.session_state:
+    # Delta-compressed history of the preview document (undo/redo and diffs)
+    st.session_state.versions = VersionStore(st.session_state.current_content)
+if 'digests' not in st.session_state:
+    # Message id -> digest of a long paste (merged profile + condensed context), built once
+    st.session_state.digests = {}
+
+def set_content(content):
+    """Update the preview document and record it as a new version"""
+    st.session_state.current_content = content
+    st.session_state.versions.commit(content)
+
+def extract_profile(messages):
+    """Profile from recent messages; long pastes contribute their cached digest instead of raw text"""
+    digests = st.session_state.digests
+    recent = messages[-MAX_ANALYSIS_MESSAGES:]
+    short = [msg for msg in recent if msg.id not in digests]
+    infos = [extract_user_info_from_chat(short)] + [digests[msg.id]["profile"] for msg in recent if msg.id in digests]
+    return merge_extracted_info(infos) if len(infos) > 1 else infos[0]
+
+def digest_long_input(message):
+    """Split a long paste into chunks processed in parallel; cached per message"""
+    digests = st.session_state.digests
+    if message.id not in digests:
+        with st.spinner("Reading your document..."):
+            digests[message.id] = long_input.digest(message.content)
+    # Forget digests of messages trimmed from the history
+    live = {msg.id for msg in st.session_state.messages}
+    for message_id in [m for m in digests if m not in live]:
+        del digests[message_id]
+    return digests[message.id]
+
+def load_earlier_messages():
+    st.session_state.chat_window += CHAT_PAGE_SIZE
+
+def render_chat_history():
+    """Render the newest page of messages, with a button to page in earlier ones"""
+    messages = st.session_state.messages
+    window = min(st.session_state.chat_window, len(messages))
+    hidden = len(messages) - window
+    if hidden > 0:
+        # on_click runs before the next rerun, so paging costs a single rerun
+        st.button(
+            f"⬆️ Load earlier messages ({hidden} more)",
+            key="load_earlier",
+            on_click=load_earlier_messages,
+            use_container_width=True,
+        )
+    # Bodies are read per rerun rather than cached: a decompress is far cheaper than
+    # holding a second, uncompressed copy of every message outside the hot tail
+    visible = messages[-window:] if window else []
+    for message in visible:
+        with st.chat_message(message.role):
+            # Do not allow unsafe HTML in user/LLM message rendering
+            st.markdown(message.content)
 
 # Sidebar
 with st.sidebar:
@@ -463,13 +293,20 @@ with st.sidebar:
     
     modes = ["Personal Bio", "Project Summaries", "Learning Reflections"]
     selected_mode = st.radio("Content Mode", modes, key="mode_selector")
+    st.toggle(
+        "Instant draft preview",
+        value=True,
+        key="progressive_preview",
+        help="Show a locally built draft right away, then stream the AI version over it.",
+    )
 
     # Do not reset chat history on mode switch; only regenerate content
     if selected_mode != st.session_state.mode:
         old_content = st.session_state.current_content
         st.session_state.mode = selected_mode
         # Regenerate content based on existing messages and extracted info
-        extracted_info = extract_user_info_from_chat(st.session_state.messages)
+        with profiling.section("extract"):
+            extracted_info = extract_profile(st.session_state.messages)
         st.session_state.user_data["extracted_info"] = extracted_info
         try:
             new_content = chat_core.generate_generic_content(
@@ -479,13 +316,13 @@ with st.sidebar:
                 history_limit=25,
             )
             if new_content and new_content.strip() and new_content.strip() != old_content.strip():
-                st.session_state.current_content = new_content
+                set_content(new_content)
             else:
                 # Keep old content; show subtle notice
                 st.info("Switched mode. Current content unchanged — provide more details to tailor it.")
         except Exception as e:
             st.error(f"Failed to regenerate content on mode switch: {e}")
-        st.rerun()
+        rerun()
     
     st.markdown("---")
     st.markdown("### Extracted Information")
@@ -515,68 +352,136 @@ col_left, col_right = st.columns([1, 1])
 with col_left:
     st.markdown("### 📄 Professional Content Preview")
     st.caption("Live README markdown preview — auto-updates from chat")
-    # Display-only markdown to avoid confusing editability
-    st.markdown(st.session_state.current_content)
-    # Auto-updates occur with each chat message and on mode switch; only keep Clear All
-    if st.button("🗑️ Clear All", use_container_width=True):
+    # Display-only markdown to avoid confusing editability; a placeholder so the chat
+    # handler can render the draft and stream the model output in place
+    preview = st.empty()
+    preview.markdown(st.session_state.current_content)
+    versions = st.session_state.versions
+    # Auto-updates occur with each chat message and on mode switch; undo/redo walk the versions
+    col_undo, col_redo, col_clear = st.columns(3)
+    if col_undo.button("↶ Undo", use_container_width=True, disabled=not versions.can_undo()):
+        st.session_state.current_content = versions.undo()
+        rerun()
+    if col_redo.button("↷ Redo", use_container_width=True, disabled=not versions.can_redo()):
+        st.session_state.current_content = versions.redo()
+        rerun()
+    if col_clear.button("🗑️ Clear All", use_container_width=True):
         # Cap history, then clear
-        st.session_state.messages = []
-        st.session_state.current_content = f"# {st.session_state.mode}\n\nChat to generate your {st.session_state.mode.lower()} in README format."
+        st.session_state.messages.clear()
+        st.session_state.chat_window = CHAT_PAGE_SIZE
+        st.session_state.digests = {}
+        # Drop the model-side history and cached documents too, or the next message could be skipped
+        for mode in modes:
+            session_id = f"ui_{mode.lower().replace(' ', '_')}"
+            memory.reset_session(session_id)
+            fingerprint.forget_session(session_id)
+            sections.forget_session(session_id)
+        model_router.forget_conversation("ui")
+        set_content(f"# {st.session_state.mode}\n\nChat to generate your {st.session_state.mode.lower()} in README format.")
         st.session_state.user_data["extracted_info"] = {}
-        st.rerun()
+        rerun()
+    if versions.can_undo():
+        with st.expander(f"🔀 Changes in version {versions.index + 1} of {len(versions)}"):
+            changes = section_diff(versions.get(versions.index - 1), versions.current)
+            if not changes:
+                st.caption("No section-level changes.")
+            for change in changes:
+                st.markdown(f"**{change['section']}** — {change['status']}")
+                if change["diff"]:
+                    st.code(change["diff"], language="diff")
 
 # Right Column - Chat Interface
 with col_right:
     st.markdown("### 💬 Chat with AI")
     chat_container = st.container(height=500)
-    with chat_container:
-        for message in st.session_state.messages[-MAX_MESSAGES_HISTORY:]:
-            with st.chat_message(message.get("role", "assistant")):
-                # Do not allow unsafe HTML in user/LLM message rendering
-                st.markdown(message.get("content", ""))
+    with chat_container, profiling.section("render_messages"):
+        render_chat_history()
 
     # Chat input
     if prompt := st.chat_input("Share your professional experience or paste your resume..."):
-        ts_user = datetime.now().isoformat(timespec="seconds")
         # Add user message to chat
-        st.session_state.messages.append({
-            "role": "user",
-            "content": prompt,
-            "timestamp": ts_user
-        })
+        st.session_state.messages.append("user", prompt)
         # Keep only last MAX_MESSAGES_HISTORY messages
-        if len(st.session_state.messages) > MAX_MESSAGES_HISTORY:
-            st.session_state.messages = st.session_state.messages[-MAX_MESSAGES_HISTORY:]
+        st.session_state.messages.trim(MAX_MESSAGES_HISTORY)
+        extra_input = prompt
+        if long_input.is_long(prompt):
+            # A pasted resume: chunks are summarized in parallel and sent in place of the raw text
+            with profiling.section("digest"):
+                extra_input = digest_long_input(st.session_state.messages[-1])["context"]
         # Update extracted info
-        extracted_info = extract_user_info_from_chat(st.session_state.messages)
+        with profiling.section("extract"):
+            extracted_info = extract_profile(st.session_state.messages)
         st.session_state.user_data["extracted_info"] = extracted_info
         old_content = st.session_state.current_content
-        # Generate new content for current mode without clearing history
-        try:
-            new_content = chat_core.generate_generic_content(
-                session_id=f"ui_{st.session_state.mode.lower().replace(' ', '_')}",
-                content_type=st.session_state.mode,
-                extracted_info=extracted_info,
-                extra_input=prompt,
-                history_limit=25,
-            )
-            # Decide acknowledgement based on actual change with minimal semantic check
-            if new_content and new_content.strip() and new_content.strip() != old_content.strip() and len(new_content.strip()) > 50:
-                st.session_state.current_content = new_content
-                ai_response = "Updated your content. What else would you like to include or refine?"
+        progressive = st.session_state.get("progressive_preview", False)
+        generation_args = dict(
+            session_id=f"ui_{st.session_state.mode.lower().replace(' ', '_')}",
+            content_type=st.session_state.mode,
+            extracted_info=extracted_info,
+            extra_input=extra_input,
+            history_limit=25,
+        )
+        decision = chat_core.generation_decision(**generation_args)
+        if decision["action"] == "skip":
+            # Small talk or a repeat: no model call, reuse the document generated for this fingerprint
+            if decision["document"].strip() != old_content.strip():
+                set_content(decision["document"])
+                ai_response = "Restored the content generated earlier from these details. What else would you like to include or refine?"
             else:
-                ai_response = "No significant changes detected. Try adding more specific details (skills, roles, metrics)."
-        except Exception as e:
-            st.error(f"Error updating content: {e}")
-            ai_response = "I encountered an error while updating. Your message was saved, but the content did not change."
-        ts_ai = datetime.now().isoformat(timespec="seconds")
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": ai_response,
-            "timestamp": ts_ai
-        })
-        st.rerun()
+                ai_response = "Nothing new to add to your content from that. Share specifics (skills, roles, projects, metrics) to update it."
+        else:
+            draft = None
+            if progressive:
+                # Local draft renders instantly while the model call is in flight
+                with profiling.section("draft"):
+                    draft = create_comprehensive_fallback(st.session_state.mode, extracted_info)
+                preview.markdown(draft)
+            # Generate new content for current mode without clearing history
+            try:
+                if progressive:
+                    parts = []
+                    for chunk in chat_core.stream_generic_content(**generation_args):
+                        parts.append(chunk)
+                        preview.markdown("".join(parts) + " ▌")
+                    new_content = "".join(parts)
+                else:
+                    new_content = chat_core.generate_generic_content(**generation_args)
+                # Decide acknowledgement based on actual change with minimal semantic check
+                if new_content and new_content.strip() and new_content.strip() != old_content.strip() and len(new_content.strip()) > 50:
+                    set_content(new_content)
+                    ai_response = "Updated your content. What else would you like to include or refine?"
+                else:
+                    ai_response = "No significant changes detected. Try adding more specific details (skills, roles, metrics)."
+            except Exception as e:
+                st.error(f"Error updating content: {e}")
+                if draft:
+                    # Keep the draft the user has already seen rather than reverting the preview
+                    set_content(draft)
+                    ai_response = "I couldn't reach the AI model, so the preview shows a draft built from your details."
+                else:
+                    ai_response = "I encountered an error while updating. Your message was saved, but the content did not change."
+        st.session_state.messages.append("assistant", ai_response)
+        rerun()
 
 # Footer
 st.markdown("---")
-st.caption("© DevFolio AI — Comprehensive professional profile generation.")
\ No newline at end of file
+st.caption("© DevFolio AI — Comprehensive professional profile generation.")
+
+# Profiling breakdown (only when profiling is on)
+if PROFILING:
+    finish_profile()
+    runs = st.session_state.get("profile_runs", [])
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("⏱️ Rerun profile", expanded=True):
+            for i, run in enumerate(reversed(runs)):
+                label = "Latest" if i == 0 else f"-{i}"
+                line = f"{label}: {run['wall_ms']:.0f} ms, peak {run['memory_peak_kb']:.0f} KB"
+                if run.get("triggered_rerun"):
+                    # The run that did the work (model call, extraction, ...), before its redraw
+                    st.markdown(f"**{line} — handled input**")
+                else:
+                    st.caption(line)
+                for name, sec in sorted(run["sections"].items(), key=lambda kv: -kv[1]["ms"]):
+                    st.write(f"`{name}` {sec['ms']:.1f} ms × {sec['calls']}")
+                st.caption(f"Stats: {run['files']['json']}")
\ No newline at end of file
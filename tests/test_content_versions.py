@@ -0,0 +1,68 @@
+from backend.content_versions import VersionStore, apply_delta, make_delta
+
+
+def _keyframes(store):
+    return sum(1 for entry in store._back if entry and isinstance(entry[0], str))
+
+
+def test_delta_round_trip():
+    source = ["# Bio", "", "Python engineer", "## Skills", "- Python"]
+    target = ["# Bio", "", "Senior Python engineer", "## Skills", "- Python", "- Docker"]
+    delta = make_delta(source, target)
+    assert apply_delta(source, delta) == target
+    assert apply_delta(target, make_delta(target, source)) == source
+    assert make_delta(source, source) == ()
+
+
+def test_every_version_reconstructs():
+    store = VersionStore("v0", keyframe_every=4)
+    for i in range(1, 20):
+        store.commit(f"# Doc\n\nline {i}\n" + "same\n" * 5)
+    assert len(store) == 20
+    assert store.get(0) == "v0"
+    for i in range(1, 20):
+        assert store.get(i) == f"# Doc\n\nline {i}\n" + "same\n" * 5
+    assert store.get(-1) == store.latest
+    assert _keyframes(store) == 19 // 4
+
+
+def test_unchanged_commit_is_ignored():
+    store = VersionStore("a")
+    assert store.commit("a") is False
+    assert len(store) == 1
+
+
+def test_undo_redo_and_branch_discard():
+    store = VersionStore("v0")
+    for text in ("v1", "v2", "v3"):
+        store.commit(text)
+    assert store.undo() == "v2"
+    assert store.undo() == "v1"
+    assert store.redo() == "v2"
+    assert store.can_redo()
+    store.commit("v2b")
+    assert not store.can_redo()
+    assert [store.get(i) for i in range(len(store))] == ["v0", "v1", "v2", "v2b"]
+    assert store.undo() == "v2"
+
+
+def test_undo_stops_at_oldest():
+    store = VersionStore("v0")
+    store.commit("v1")
+    assert store.undo() == "v0"
+    assert store.undo() == "v0"
+    assert not store.can_undo()
+
+
+def test_cap_keeps_newest_versions_and_keyframes():
+    store = VersionStore("v0", keyframe_every=32, max_versions=200)
+    for i in range(1, 451):
+        store.commit(f"# Doc\nversion {i}\n")
+    assert len(store) == 200
+    assert store.get(0) == "# Doc\nversion 251\n"
+    assert store.latest == "# Doc\nversion 450\n"
+    # Keyframes keep being written after trimming starts
+    assert _keyframes(store) >= 199 // 32
+    # ... so reconstructing the oldest version starts within keyframe_every entries
+    first_keyframe = next(i for i, e in enumerate(store._back) if e and isinstance(e[0], str))
+    assert first_keyframe < 32
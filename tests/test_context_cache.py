@@ -0,0 +1,99 @@
+import pytest
+from langchain_core.messages import AIMessage, SystemMessage
+
+from backend import chat_core, context_cache, session_memory
+
+
+class RecordingCache(context_cache.LocalContextCache):
+    def __init__(self):
+        super().__init__()
+        self.prefixes = []
+
+    def _create(self, key, model, parts):
+        self.prefixes.append(list(parts))
+        return super()._create(key, model, parts)
+
+
+class StubModel:
+    """Reports the prefix as cached input once the provider would have it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        cached = 100 if kwargs.get("cached_content") else 0
+        return AIMessage(
+            content="ok",
+            usage_metadata={
+                "input_tokens": 120,
+                "output_tokens": 5,
+                "total_tokens": 125,
+                "input_token_details": {"cache_read": cached},
+            },
+        )
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    model = StubModel()
+    cache = RecordingCache()
+    monkeypatch.setattr(chat_core, "_get_llm", lambda *args: model)
+    context_cache.set_backend(cache)
+    context_cache.reset_usage()
+    session_memory.set_store(session_memory.InMemoryStore())
+    yield model, cache
+    context_cache.set_backend(None)
+    context_cache.reset_usage()
+    context_cache.config.context_cache_mode.cache_clear()
+    session_memory.SESSIONS.clear()
+    session_memory.set_store(None)
+
+
+def test_prefix_is_served_from_the_cache(stub):
+    model, cache = stub
+    for text in ("first question", "second question"):
+        chat_core.chat_with_history("cache-test", text, system_prompt="You write bios.", profile='{"name":"Jo"}')
+
+    assert len(model.calls) == 2
+    names = {kwargs.get("cached_content") for _messages, kwargs in model.calls}
+    assert len(names) == 1 and next(iter(names)).startswith("cachedContents/")
+    for messages, _kwargs in model.calls:
+        # The system prefix travels in the cache, not in the request
+        assert not any(isinstance(m, SystemMessage) for m in messages)
+        assert all("You write bios." not in m.content for m in messages)
+    # Created once from the stable prefix and hit on the second call
+    assert len(cache.prefixes) == 1 and cache.prefixes[0][-1] == "You write bios."
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_prefix_bytes_are_identical_across_calls(stub):
+    _model, cache = stub
+    first = chat_core._stable_prefix("You write bios.")
+    chat_core.chat_with_history("cache-test", "a", system_prompt="You write bios.")
+    chat_core.chat_with_history("cache-test", "b", system_prompt="You write bios.")
+    assert chat_core._stable_prefix("You write bios.") == first
+    assert context_cache.prefix_key("m", first) == context_cache.prefix_key("m", chat_core._stable_prefix("You write bios."))
+    assert len(cache.prefixes) == 1
+
+
+def test_usage_report_splits_cached_and_uncached(stub):
+    chat_core.chat_with_history("cache-test", "a", system_prompt="You write bios.")
+    chat_core.chat_with_history("cache-test", "b", system_prompt="You write bios.")
+    report = context_cache.usage_report()
+    assert report["calls"] == 2
+    assert report["input_tokens"] == 240
+    assert report["cached_input_tokens"] == 200
+    assert report["uncached_input_tokens"] == 40
+    assert report["cached_ratio"] == pytest.approx(200 / 240, abs=1e-3)
+
+
+def test_prefix_is_sent_inline_without_a_backend(stub, monkeypatch):
+    model, _cache = stub
+    context_cache.set_backend(None)
+    monkeypatch.setenv("CONTEXT_CACHE", "off")
+    context_cache.config.context_cache_mode.cache_clear()
+    chat_core.chat_with_history("cache-test", "a", system_prompt="You write bios.")
+    messages, kwargs = model.calls[-1]
+    assert "cached_content" not in kwargs
+    assert any(isinstance(m, SystemMessage) and m.content == "You write bios." for m in messages)
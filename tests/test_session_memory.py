@@ -0,0 +1,81 @@
+import pytest
+
+from backend import session_memory
+from backend.session_memory import LocalRedis, RedisStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_memory.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def store(clock):
+    return RedisStore(ttl=60, max_messages=5, client=LocalRedis())
+
+
+def _contents(history):
+    return [m["content"] for m in history]
+
+
+def test_append_and_read_in_order(store):
+    store.append_message("s", "human", "hi")
+    store.append_message("s", "ai", "hello")
+    assert store.get_history("s") == [
+        {"role": "human", "content": "hi"},
+        {"role": "ai", "content": "hello"},
+    ]
+    assert store.get_history("other") == []
+
+
+def test_limit_reads_the_tail(store):
+    for i in range(4):
+        store.append_message("s", "human", f"m{i}")
+    assert _contents(store.get_history("s", 2)) == ["m2", "m3"]
+    assert _contents(store.get_history("s", 10)) == ["m0", "m1", "m2", "m3"]
+
+
+def test_ltrim_caps_session_length(store):
+    for i in range(8):
+        store.append_message("s", "human", f"m{i}")
+    assert _contents(store.get_history("s")) == ["m3", "m4", "m5", "m6", "m7"]
+
+
+def test_idle_session_expires(store, clock):
+    store.append_message("s", "human", "hi")
+    clock.now += 61
+    assert store.get_history("s") == []
+
+
+def test_read_refreshes_ttl(store, clock):
+    store.append_message("s", "human", "hi")
+    clock.now += 50
+    assert _contents(store.get_history("s")) == ["hi"]
+    clock.now += 50
+    # 100s after the append, but only 50s after the last read
+    assert _contents(store.get_history("s")) == ["hi"]
+    clock.now += 61
+    assert store.get_history("s") == []
+
+
+def test_reset_session_only_clears_that_session(store):
+    store.append_message("a", "human", "x")
+    store.append_message("b", "human", "y")
+    store.reset_session("a")
+    assert store.get_history("a") == []
+    assert _contents(store.get_history("b")) == ["y"]
+
+
+def test_unicode_round_trip(store):
+    store.append_message("s", "human", "Zoë — ünïcode ✓")
+    assert _contents(store.get_history("s")) == ["Zoë — ünïcode ✓"]